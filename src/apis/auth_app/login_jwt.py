@@ -6,6 +6,11 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.verify_user_credentials_by_username import verify_user_credentials_by_username
+from modules.auth_app.password_hashing_pool import PasswordHashingBusy
+from modules.auth_app.refresh_tokens import (
+    ACCESS_TOKEN_LIFETIME, REFRESH_TOKEN_LIFETIME, issue_access_token, issue_refresh_token,
+    rotate_refresh_token, revoke_refresh_token
+)
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
@@ -32,23 +37,78 @@ def login():
         user_id, is_valid = verify_user_credentials_by_username(username, password)
         
         if is_valid and user_id:
-            # Generate JWT token with user_id (to maintain compatibility with send_message)
-            token = jwt.encode({
-                'user_id': user_id,  # Keep user_id for send_message compatibility
-                'username': username,  # Include username for reference
-                'exp': datetime.utcnow() + timedelta(hours=24)
-            }, JWT_SECRET_KEY, algorithm='HS256')
+            # Short-lived access token (same claims as before) plus a refresh
+            # token so clients don't send the password again when it expires
+            token = issue_access_token(user_id, username)
+            refresh_token = issue_refresh_token(user_id, username)
 
             return jsonify({
                 'message': 'Login successful!',
                 'token': token,
+                'refresh_token': refresh_token,
                 'user_id': user_id,  # Return user_id for client reference
                 'username': username,  # Return username for client reference
-                'expires_in': '24 hours'
+                'expires_in': int(ACCESS_TOKEN_LIFETIME.total_seconds()),
+                'refresh_expires_in': int(REFRESH_TOKEN_LIFETIME.total_seconds())
             }), 200
         else:
             return jsonify({'error': 'Invalid username or password!'}), 401
 
+    except PasswordHashingBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+
     except Exception as e:
         print(f"Login error: {e}")
         return jsonify({'error': 'An error occurred during login'}), 500
+
+
+@login_jwt.route('/refresh', methods=['POST'])
+def refresh():
+    """Exchange a refresh token for a new access token (and a new refresh token)"""
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or not data.get('refresh_token'):
+            return jsonify({'error': 'refresh_token is required!'}), 400
+
+        # Single indexed lookup by token hash; no password verification
+        result = rotate_refresh_token(data['refresh_token'])
+        if not result:
+            return jsonify({'error': 'Refresh token is invalid, expired or revoked!'}), 401
+
+        user_id, username, refresh_token = result
+
+        return jsonify({
+            'message': 'Token refreshed!',
+            'token': issue_access_token(user_id, username),
+            'refresh_token': refresh_token,
+            'user_id': user_id,
+            'username': username,
+            'expires_in': int(ACCESS_TOKEN_LIFETIME.total_seconds()),
+            'refresh_expires_in': int(REFRESH_TOKEN_LIFETIME.total_seconds())
+        }), 200
+
+    except Exception as e:
+        print(f"Refresh error: {e}")
+        return jsonify({'error': 'An error occurred during token refresh'}), 500
+
+
+@login_jwt.route('/revoke', methods=['POST'])
+def revoke():
+    """Revoke a refresh token (logout), or all of the user's refresh tokens with all_sessions"""
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or not data.get('refresh_token'):
+            return jsonify({'error': 'refresh_token is required!'}), 400
+
+        revoked = revoke_refresh_token(data['refresh_token'], bool(data.get('all_sessions')))
+
+        return jsonify({
+            'message': 'Refresh token revoked!' if revoked else 'No active refresh token to revoke',
+            'revoked': revoked
+        }), 200
+
+    except Exception as e:
+        print(f"Revoke error: {e}")
+        return jsonify({'error': 'An error occurred during token revocation'}), 500
@@ -9,6 +9,9 @@ from modules.chat.init_chat_db import init_chat_db
 from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.users_credentials_verification_from_db import verify_user_credentials
 from modules.chat.check_user_exist_from_db import check_user_exists
+from modules.database.connection_pool import get_db_connection
+from modules.chat.parse_pagination_args import parse_pagination_args
+from modules.chat.fetch_message_page import fetch_conversation_messages, next_page_cursor, format_messages
 
 
 conversation=Blueprint('conversation',__name__)
@@ -24,40 +27,43 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 @conversation.route('/auth/conversation/<other_user_id>', methods=['GET'])
 @token_required
 def get_conversation_auth(current_user, other_user_id):
-    """Get conversation between authenticated user and another user"""
+    """Get one page of the conversation between authenticated user and another user
+
+    Without a cursor the most recent page is returned. Pass before_id to page
+    back through older messages or after_id to fetch newer ones. Messages in a
+    page are always ordered oldest first.
+    """
     try:
         user_id = current_user['user_id']
 
-        conn = sqlite3.connect(CHAT_DATABASE)
-        cursor = conn.cursor()
+        try:
+            before_id, after_id, limit = parse_pagination_args()
+        except ValueError as e:
+            return jsonify({
+                'error': str(e)
+            }), 400
+
+        with get_db_connection(CHAT_DATABASE) as conn:
+            cursor = conn.cursor()
 
-        # Get messages between the two users
-        cursor.execute('''
-            SELECT id, sender_user_id, recipient_user_id, message, timestamp, is_read
-            FROM messages
-            WHERE (sender_user_id = ? AND recipient_user_id = ?)
-               OR (sender_user_id = ? AND recipient_user_id = ?)
-            ORDER BY timestamp ASC
-        ''', (user_id, other_user_id, other_user_id, user_id))
+            # Get a page of messages between the two users
+            rows, has_more = fetch_conversation_messages(
+                cursor, user_id, other_user_id, before_id, after_id, limit
+            )
 
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                'message_id': row[0],
-                'sender': row[1],
-                'recipient': row[2],
-                'message': row[3],
-                'timestamp': row[4],
-                'is_read': bool(row[5]),
-                'direction': 'sent' if row[1] == user_id else 'received'
-            })
+            next_cursor = next_page_cursor(rows, after_id, has_more)
+            if after_id is None:
+                rows.reverse()
 
-        conn.close()
+            messages = format_messages(cursor, rows, user_id)
 
         return jsonify({
             'conversation': messages,
             'participants': [user_id, other_user_id],
-            'total_messages': len(messages)
+            'total_messages': len(messages),
+            'limit': limit,
+            'has_more': has_more,
+            'next_cursor': next_cursor
         }), 200
 
     except Exception as e:
@@ -9,6 +9,13 @@ from modules.chat.init_chat_db import init_chat_db
 from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.users_credentials_verification_from_db import verify_user_credentials
 from modules.chat.check_user_exist_from_db import check_user_exists
+from modules.database.connection_pool import get_db_connection
+from modules.chat.message_counters import record_message_deleted
+from modules.chat.read_cursors import get_read_cursor
+from modules.chat.message_archive import find_archived_message, delete_archived_message
+from modules.chat.message_search import unindex_message
+from modules.chat.event_bus import event_bus
+from modules.chat.change_log import record_message_removed
 
 
 # Configuration
@@ -28,34 +35,55 @@ def delete_message_auth(current_user, message_id):
     try:
         user_id = current_user['user_id']
 
-        conn = sqlite3.connect(CHAT_DATABASE)
-        cursor = conn.cursor()
-
-        # Check if message exists and user is the sender
-        cursor.execute('''
-            SELECT sender_user_id FROM messages WHERE id = ?
-        ''', (message_id,))
-
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return jsonify({
-                'error': 'Message not found'
-            }), 404
-
-        if result[0] != user_id:
-            conn.close()
-            return jsonify({
-                'error': 'You can only delete messages you sent'
-            }), 403
-
-        # Delete the message
-        cursor.execute('''
-            DELETE FROM messages WHERE id = ?
-        ''', (message_id,))
-
-        conn.commit()
-        conn.close()
+        with get_db_connection(CHAT_DATABASE) as conn:
+            # Lock before reading so the counters match the row we delete
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+
+            # Check if message exists and user is the sender
+            cursor.execute('''
+                SELECT sender_user_id, recipient_user_id, conversation_key, is_read
+                FROM messages WHERE id = ?
+            ''', (message_id,))
+
+            result = cursor.fetchone()
+            archive_path = None
+            if not result:
+                # Older messages may have been moved to an archive file
+                archived = find_archived_message(cursor, message_id)
+                if archived:
+                    archive_path, row = archived
+                    result = (row[1], row[2], row[6], row[5])
+
+            if not result:
+                return jsonify({
+                    'error': 'Message not found'
+                }), 404
+
+            if result[0] != user_id:
+                return jsonify({
+                    'error': 'You can only delete messages you sent'
+                }), 403
+
+            # Delete the message
+            if archive_path:
+                delete_archived_message(cursor, archive_path, message_id)
+            else:
+                cursor.execute('''
+                    DELETE FROM messages WHERE id = ?
+                ''', (message_id,))
+            unindex_message(cursor, message_id)
+
+            was_unread = not result[3] and int(message_id) > get_read_cursor(cursor, result[1], result[2])
+            record_message_deleted(cursor, result[0], result[1], result[2], was_unread)
+            record_message_removed(cursor, result[0], result[1], message_id)
+            conn.commit()
+
+        for subscriber_id in (result[1], result[0]):
+            event_bus.publish(subscriber_id, 'message_deleted', {
+                'message_id': int(message_id),
+                'conversation_key': result[2]
+            })
 
         return jsonify({
             'message': 'Message deleted successfully'
@@ -0,0 +1,82 @@
+from flask import Flask, request, jsonify, Blueprint
+import sqlite3
+import requests
+import jwt
+from functools import wraps
+from werkzeug.security import check_password_hash
+from datetime import datetime, timedelta
+from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.check_user_exist_from_db import check_user_exists
+from modules.chat.friend_graph import friend_graph, MAX_SUGGESTIONS
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
+USER_API_URL = 'http://localhost:5000'  # User registration API URL
+AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
+JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
+DEFAULT_SUGGESTIONS = 10
+
+friend_suggestions = Blueprint('friend_suggestions', __name__)
+
+
+@friend_suggestions.route('/auth/friend_suggestions', methods=['GET'])
+@token_required
+def friend_suggestions_auth(current_user):
+    """Suggest friends of friends, ranked by number of mutual friends"""
+    try:
+        user_id = current_user['user_id']
+
+        try:
+            limit = int(request.args.get('limit', DEFAULT_SUGGESTIONS))
+        except ValueError:
+            return jsonify({
+                'error': 'limit must be an integer'
+            }), 400
+
+        if limit < 1 or limit > MAX_SUGGESTIONS:
+            return jsonify({
+                'error': f'limit must be between 1 and {MAX_SUGGESTIONS}'
+            }), 400
+
+        suggestions = friend_graph.suggest_friends(user_id, limit)
+
+        return jsonify({
+            'user_id': user_id,
+            'suggestions': suggestions,
+            'total_suggestions': len(suggestions)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to get friend suggestions: {str(e)}'
+        }), 500
+
+
+@friend_suggestions.route('/auth/mutual_friends/<other_user_id>', methods=['GET'])
+@token_required
+def mutual_friends_auth(current_user, other_user_id):
+    """Get the friends the authenticated user has in common with another user"""
+    try:
+        user_id = current_user['user_id']
+
+        if not check_user_exists(other_user_id):
+            return jsonify({
+                'error': 'User not found'
+            }), 404
+
+        mutual_friends = friend_graph.mutual_friends(user_id, other_user_id)
+
+        return jsonify({
+            'user_id': user_id,
+            'other_user_id': other_user_id,
+            'mutual_friends': mutual_friends,
+            'total_mutual_friends': len(mutual_friends)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to get mutual friends: {str(e)}'
+        }), 500
@@ -6,12 +6,15 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
+from modules.database.connection_pool import get_db_connection
+from modules.chat.change_log import entity_version
+from modules.http.conditional_get import conditional_get, PRIVATE_CACHE_CONTROL
 
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
@@ -19,34 +22,40 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 
 get_friend_requests = Blueprint('get_friend_requests', __name__)
 
+
+def friend_requests_version(current_user):
+    """ETag version shared by all friend request lists of a user"""
+    return entity_version(current_user['user_id'], 'friend_request')
+
+
 @get_friend_requests.route('/auth/get_friend_requests', methods=['GET'])
 @token_required
+@conditional_get(friend_requests_version, PRIVATE_CACHE_CONTROL)
 def get_friend_requests_auth(current_user):
     """Get all friend requests for the authenticated user (both sent and received)"""
     try:
         user_id = current_user['user_id']
         
-        conn = sqlite3.connect(FR_REQUESTS_DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(FR_REQUESTS_DATABASE) as conn:
+            cursor = conn.cursor()
         
-        # Get all friend requests where user is either sender or recipient
-        cursor.execute('''
-            SELECT 
-                request_id,
-                sender_user_id,
-                sender_username,
-                recipient_user_id,
-                recipient_username,
-                status,
-                request_data,
-                timestamp
-            FROM friend_requests 
-            WHERE sender_user_id = ? OR recipient_user_id = ?
-            ORDER BY timestamp DESC
-        ''', (user_id, user_id))
+            # Get all friend requests where user is either sender or recipient
+            cursor.execute('''
+                SELECT 
+                    request_id,
+                    sender_user_id,
+                    sender_username,
+                    recipient_user_id,
+                    recipient_username,
+                    status,
+                    request_data,
+                    timestamp
+                FROM friend_requests 
+                WHERE sender_user_id = ? OR recipient_user_id = ?
+                ORDER BY timestamp DESC
+            ''', (user_id, user_id))
         
-        requests_data = cursor.fetchall()
-        conn.close()
+            requests_data = cursor.fetchall()
         
         if not requests_data:
             return jsonify({
@@ -93,32 +102,32 @@ def get_friend_requests_auth(current_user):
 
 @get_friend_requests.route('/auth/get_incoming_friend_requests', methods=['GET'])
 @token_required
+@conditional_get(friend_requests_version, PRIVATE_CACHE_CONTROL)
 def get_incoming_friend_requests_auth(current_user):
     """Get only incoming friend requests for the authenticated user"""
     try:
         user_id = current_user['user_id']
         
-        conn = sqlite3.connect(FR_REQUESTS_DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(FR_REQUESTS_DATABASE) as conn:
+            cursor = conn.cursor()
         
-        # Get incoming friend requests (where user is recipient)
-        cursor.execute('''
-            SELECT 
-                request_id,
-                sender_user_id,
-                sender_username,
-                recipient_user_id,
-                recipient_username,
-                status,
-                request_data,
-                timestamp
-            FROM friend_requests 
-            WHERE recipient_user_id = ?
-            ORDER BY timestamp DESC
-        ''', (user_id,))
+            # Get incoming friend requests (where user is recipient)
+            cursor.execute('''
+                SELECT 
+                    request_id,
+                    sender_user_id,
+                    sender_username,
+                    recipient_user_id,
+                    recipient_username,
+                    status,
+                    request_data,
+                    timestamp
+                FROM friend_requests 
+                WHERE recipient_user_id = ?
+                ORDER BY timestamp DESC
+            ''', (user_id,))
         
-        requests_data = cursor.fetchall()
-        conn.close()
+            requests_data = cursor.fetchall()
         
         incoming_requests = []
         for req in requests_data:
@@ -148,32 +157,32 @@ def get_incoming_friend_requests_auth(current_user):
 
 @get_friend_requests.route('/auth/get_outgoing_friend_requests', methods=['GET'])
 @token_required
+@conditional_get(friend_requests_version, PRIVATE_CACHE_CONTROL)
 def get_outgoing_friend_requests_auth(current_user):
     """Get only outgoing friend requests for the authenticated user"""
     try:
         user_id = current_user['user_id']
         
-        conn = sqlite3.connect(FR_REQUESTS_DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(FR_REQUESTS_DATABASE) as conn:
+            cursor = conn.cursor()
         
-        # Get outgoing friend requests (where user is sender)
-        cursor.execute('''
-            SELECT 
-                request_id,
-                sender_user_id,
-                sender_username,
-                recipient_user_id,
-                recipient_username,
-                status,
-                request_data,
-                timestamp
-            FROM friend_requests 
-            WHERE sender_user_id = ?
-            ORDER BY timestamp DESC
-        ''', (user_id,))
+            # Get outgoing friend requests (where user is sender)
+            cursor.execute('''
+                SELECT 
+                    request_id,
+                    sender_user_id,
+                    sender_username,
+                    recipient_user_id,
+                    recipient_username,
+                    status,
+                    request_data,
+                    timestamp
+                FROM friend_requests 
+                WHERE sender_user_id = ?
+                ORDER BY timestamp DESC
+            ''', (user_id,))
         
-        requests_data = cursor.fetchall()
-        conn.close()
+            requests_data = cursor.fetchall()
         
         outgoing_requests = []
         for req in requests_data:
@@ -203,32 +212,32 @@ def get_outgoing_friend_requests_auth(current_user):
 
 @get_friend_requests.route('/auth/get_pending_friend_requests', methods=['GET'])
 @token_required
+@conditional_get(friend_requests_version, PRIVATE_CACHE_CONTROL)
 def get_pending_friend_requests_auth(current_user):
     """Get only pending friend requests for the authenticated user"""
     try:
         user_id = current_user['user_id']
         
-        conn = sqlite3.connect(FR_REQUESTS_DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(FR_REQUESTS_DATABASE) as conn:
+            cursor = conn.cursor()
         
-        # Get pending friend requests where user is either sender or recipient
-        cursor.execute('''
-            SELECT 
-                request_id,
-                sender_user_id,
-                sender_username,
-                recipient_user_id,
-                recipient_username,
-                status,
-                request_data,
-                timestamp
-            FROM friend_requests 
-            WHERE (sender_user_id = ? OR recipient_user_id = ?) AND status = 'pending'
-            ORDER BY timestamp DESC
-        ''', (user_id, user_id))
+            # Get pending friend requests where user is either sender or recipient
+            cursor.execute('''
+                SELECT 
+                    request_id,
+                    sender_user_id,
+                    sender_username,
+                    recipient_user_id,
+                    recipient_username,
+                    status,
+                    request_data,
+                    timestamp
+                FROM friend_requests 
+                WHERE (sender_user_id = ? OR recipient_user_id = ?) AND status = 'pending'
+                ORDER BY timestamp DESC
+            ''', (user_id, user_id))
         
-        requests_data = cursor.fetchall()
-        conn.close()
+            requests_data = cursor.fetchall()
         
         pending_incoming = []
         pending_outgoing = []
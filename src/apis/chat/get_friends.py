@@ -6,10 +6,10 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
-from modules.chat.init_friends_db import init_friends_db
-from modules.chat.init_request_db import init_friend_requests_db
 from modules.chat.remove_friendship import remove_friendship
 from modules.chat.get_user_friends import get_user_friends
+from modules.chat.change_log import entity_version
+from modules.http.conditional_get import conditional_get, PRIVATE_CACHE_CONTROL
 from modules.chat.get_user_by_username import get_user_by_username
 from modules.chat.add_friendship import add_friendship
 from modules.chat.check_existing_friend_request import check_existing_friend_request
@@ -19,8 +19,8 @@ from modules.chat.get_user_by_userid import get_username_by_user_id
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
@@ -28,38 +28,14 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 get_friends=Blueprint('get_friends',__name__)
 
 
-def init_friends_db():
-    """Initialize the friends database"""
-    try:
-        conn = sqlite3.connect(FRIENDS_DATABASE)
-        cursor = conn.cursor()
-
-        # Create friends table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS friends (
-                friendship_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user1_id TEXT NOT NULL,
-                user1_username TEXT NOT NULL,
-                user2_id TEXT NOT NULL,
-                user2_username TEXT NOT NULL,
-                friendship_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user1_id) REFERENCES users(user_id),
-                FOREIGN KEY (user2_id) REFERENCES users(user_id),
-                UNIQUE(user1_id, user2_id),
-                UNIQUE(user2_id, user1_id)
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
-        print("Friends database initialized successfully")
-
-    except Exception as e:
-        print(f"Error initializing friends database: {e}")
+def friends_version(current_user):
+    """ETag version of the friend list"""
+    return entity_version(current_user['user_id'], 'friend')
 
 
 @get_friends.route('/auth/get_friends', methods=['GET'])
 @token_required
+@conditional_get(friends_version, PRIVATE_CACHE_CONTROL)
 def get_friends_auth(current_user):
     """Get all friends for the authenticated user"""
     try:
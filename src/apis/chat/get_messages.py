@@ -9,6 +9,10 @@ from modules.chat.init_chat_db import init_chat_db
 from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.users_credentials_verification_from_db import verify_user_credentials
 from modules.chat.check_user_exist_from_db import check_user_exists
+from modules.database.connection_pool import get_db_connection
+from modules.chat.parse_pagination_args import parse_pagination_args
+from modules.chat.fetch_message_page import fetch_user_messages, next_page_cursor, format_messages
+from modules.chat.event_bus import event_bus
 
 
 
@@ -20,46 +24,107 @@ CHAT_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
+DEFAULT_WAIT_SECONDS = 25
+MAX_WAIT_SECONDS = 60
 
 
 @get_messages.route('/auth/messages', methods=['GET'])
 @token_required
 def get_messages_auth(current_user):
-    """Get messages for authenticated user"""
+    """Get one page of messages for authenticated user
+
+    Without a cursor the most recent page is returned. Pass before_id to page
+    back through older messages or after_id to fetch newer ones. Messages in a
+    page are always ordered newest first.
+    """
     try:
         user_id = current_user['user_id']
 
-        conn = sqlite3.connect(CHAT_DATABASE)
-        cursor = conn.cursor()
-
-        # Get all messages where user is either sender or recipient
-        cursor.execute('''
-            SELECT id, sender_user_id, recipient_user_id, message, timestamp, is_read
-            FROM messages
-            WHERE sender_user_id = ? OR recipient_user_id = ?
-            ORDER BY timestamp DESC
-        ''', (user_id, user_id))
-
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                'message_id': row[0],
-                'sender': row[1],
-                'recipient': row[2],
-                'message': row[3],
-                'timestamp': row[4],
-                'is_read': bool(row[5]),
-                'direction': 'sent' if row[1] == user_id else 'received'
-            })
-
-        conn.close()
+        try:
+            before_id, after_id, limit = parse_pagination_args()
+        except ValueError as e:
+            return jsonify({
+                'error': str(e)
+            }), 400
+
+        with get_db_connection(CHAT_DATABASE) as conn:
+            cursor = conn.cursor()
+
+            # Get a page of messages where user is either sender or recipient
+            rows, has_more = fetch_user_messages(cursor, user_id, before_id, after_id, limit)
+
+            next_cursor = next_page_cursor(rows, after_id, has_more)
+            if after_id is not None:
+                rows.reverse()
+
+            messages = format_messages(cursor, rows, user_id)
 
         return jsonify({
             'messages': messages,
-            'total_messages': len(messages)
+            'total_messages': len(messages),
+            'limit': limit,
+            'has_more': has_more,
+            'next_cursor': next_cursor
         }), 200
 
     except Exception as e:
         return jsonify({
             'error': f'Failed to fetch messages: {str(e)}'
         }), 500
+
+
+@get_messages.route('/auth/messages/wait', methods=['GET'])
+@token_required
+def wait_for_messages_auth(current_user):
+    """Long-poll for messages newer than after_id
+
+    Returns at once if there already are newer messages, otherwise parks
+    until one arrives or timeout seconds pass. Only the delta is returned,
+    newest first, in the same shape as /auth/messages.
+    """
+    try:
+        user_id = current_user['user_id']
+
+        try:
+            before_id, after_id, limit = parse_pagination_args()
+            if after_id is None:
+                raise ValueError('after_id is required')
+            timeout = float(request.args.get('timeout', DEFAULT_WAIT_SECONDS))
+            if timeout < 0 or timeout > MAX_WAIT_SECONDS:
+                raise ValueError(f'timeout must be between 0 and {MAX_WAIT_SECONDS} seconds')
+        except ValueError as e:
+            return jsonify({
+                'error': str(e)
+            }), 400
+
+        def fetch_delta():
+            with get_db_connection(CHAT_DATABASE) as conn:
+                cursor = conn.cursor()
+                rows, has_more = fetch_user_messages(cursor, user_id, None, after_id, limit)
+                next_cursor = next_page_cursor(rows, after_id, has_more)
+                rows.reverse()
+                return format_messages(cursor, rows, user_id), has_more, next_cursor
+
+        # Subscribe and note the bus position first so a message committed during the query still wakes us
+        with event_bus.subscription(user_id):
+            sequence = event_bus.current_sequence()
+            messages, has_more, next_cursor = fetch_delta()
+
+            # A resync_required wake-up also just refetches; the delta comes from the database
+            if not messages and timeout > 0:
+                if event_bus.wait(user_id, sequence, timeout, event_types={'message'}):
+                    messages, has_more, next_cursor = fetch_delta()
+
+        return jsonify({
+            'messages': messages,
+            'total_messages': len(messages),
+            'limit': limit,
+            'has_more': has_more,
+            'next_cursor': next_cursor,
+            'timed_out': not messages
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to wait for messages: {str(e)}'
+        }), 500
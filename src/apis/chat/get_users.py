@@ -9,6 +9,9 @@ from modules.chat.init_chat_db import init_chat_db
 from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.users_credentials_verification_from_db import verify_user_credentials
 from modules.chat.check_user_exist_from_db import check_user_exists
+from modules.database.users_database import resolve_users_database, get_users_version
+from modules.http.streaming_json import stream_collection
+from modules.http.conditional_get import conditional_get, PRIVATE_CACHE_CONTROL
 
 
 # Configuration
@@ -23,51 +26,17 @@ get_users=Blueprint('get_users',__name__)
 
 @get_users.route('/auth/users', methods=['GET'])
 @token_required
+@conditional_get(lambda current_user: get_users_version(), PRIVATE_CACHE_CONTROL)
 def get_users_auth(current_user):
-    """Get list of all users (JWT authenticated)"""
+    """Get list of all users (JWT authenticated), streamed as JSON or NDJSON"""
     try:
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
+        query = "SELECT user_id, username, created_at FROM users"
 
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                # Test if the table exists
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    break
-                user_conn.close()
-                user_conn = None
-            except:
-                if user_conn:
-                    user_conn.close()
-                continue
-
-        if not user_conn:
-            return jsonify({
-                'error': 'Could not find users database'
-            }), 500
-
-        cursor = user_conn.cursor()
-        cursor.execute("SELECT user_id, email, full_name, created_at FROM users")
-        users = []
-
-        for row in cursor.fetchall():
-            users.append({
-                'user_id': row[0],
-                'email': row[1],
-                'full_name': row[2],
-                'created_at': row[3]
-            })
-
-        user_conn.close()
-
-        return jsonify({
-            'users': users,
-            'total_users': len(users)
-        }), 200
+        return stream_collection(resolve_users_database(), query, lambda row: {
+            'user_id': row[0],
+            'username': row[1],
+            'created_at': row[2]
+        }, 'users', 'total_users')
 
     except Exception as e:
         return jsonify({
@@ -9,6 +9,13 @@ from modules.chat.init_chat_db import init_chat_db
 from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.users_credentials_verification_from_db import verify_user_credentials
 from modules.chat.check_user_exist_from_db import check_user_exists
+from modules.database.connection_pool import get_db_connection
+from modules.chat.message_counters import record_messages_read
+from modules.chat.read_cursors import get_read_cursor, advance_read_cursor
+from modules.chat.make_conversation_key import make_conversation_key
+from modules.chat.message_archive import find_archived_message, mark_archived_message_read
+from modules.chat.event_bus import event_bus
+from modules.chat.change_log import record_message_read, record_read_cursor
 
 
 # Configuration
@@ -27,34 +34,56 @@ def mark_message_read_auth(current_user, message_id):
     try:
         user_id = current_user['user_id']
 
-        conn = sqlite3.connect(CHAT_DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(CHAT_DATABASE) as conn:
+            cursor = conn.cursor()
 
-        # Check if message exists and user is the recipient
-        cursor.execute('''
-            SELECT recipient_user_id FROM messages WHERE id = ?
-        ''', (message_id,))
+            # Check if message exists and user is the recipient
+            cursor.execute('''
+                SELECT recipient_user_id, sender_user_id, conversation_key FROM messages WHERE id = ?
+            ''', (message_id,))
 
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return jsonify({
-                'error': 'Message not found'
-            }), 404
+            result = cursor.fetchone()
+            archive_path = None
+            if not result:
+                # Older messages may have been moved to an archive file
+                archived = find_archived_message(cursor, message_id)
+                if archived:
+                    archive_path, row = archived
+                    result = (row[2], row[1], row[6])
 
-        if result[0] != user_id:
-            conn.close()
-            return jsonify({
-                'error': 'You can only mark your received messages as read'
-            }), 403
+            if not result:
+                return jsonify({
+                    'error': 'Message not found'
+                }), 404
 
-        # Mark message as read
-        cursor.execute('''
-            UPDATE messages SET is_read = TRUE WHERE id = ?
-        ''', (message_id,))
+            if result[0] != user_id:
+                return jsonify({
+                    'error': 'You can only mark your received messages as read'
+                }), 403
 
-        conn.commit()
-        conn.close()
+            # Mark message as read (only the request that flips it updates the counters)
+            if archive_path:
+                flipped = mark_archived_message_read(archive_path, message_id)
+            else:
+                cursor.execute('''
+                    UPDATE messages SET is_read = TRUE WHERE id = ? AND NOT is_read
+                ''', (message_id,))
+                flipped = cursor.rowcount
+
+            # Messages behind the read cursor were already counted as read
+            if flipped and int(message_id) > get_read_cursor(cursor, user_id, result[2]):
+                record_messages_read(cursor, user_id, result[2], result[1], flipped)
+            if flipped:
+                record_message_read(cursor, result[1], user_id, message_id)
+            conn.commit()
+
+        # Read receipt for the sender
+        if flipped:
+            event_bus.publish(result[1], 'message_read', {
+                'message_id': int(message_id),
+                'conversation_key': result[2],
+                'reader_user_id': user_id
+            })
 
         return jsonify({
             'message': 'Message marked as read'
@@ -64,3 +93,60 @@ def mark_message_read_auth(current_user, message_id):
         return jsonify({
             'error': f'Failed to mark message as read: {str(e)}'
         }), 500
+
+
+@mark_as_read.route('/auth/conversation/<other_user_id>/read_up_to/<int:message_id>', methods=['PUT'])
+@token_required
+def mark_conversation_read_up_to_auth(current_user, other_user_id, message_id):
+    """Mark every message in a conversation up to message_id as read with one cursor update"""
+    try:
+        user_id = current_user['user_id']
+        conversation_key = make_conversation_key(user_id, other_user_id)
+
+        with get_db_connection(CHAT_DATABASE) as conn:
+            # Lock before reading the cursor so the unread counters stay exact
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+
+            # The cursor must point at a message in this conversation
+            cursor.execute('''
+                SELECT id FROM messages WHERE id = ? AND conversation_key = ?
+            ''', (message_id, conversation_key))
+
+            found = cursor.fetchone() is not None
+            if not found:
+                archived = find_archived_message(cursor, message_id)
+                found = archived is not None and archived[1][6] == conversation_key
+
+            if not found:
+                return jsonify({
+                    'error': 'Message not found in this conversation'
+                }), 404
+
+            last_read_message_id, newly_read = advance_read_cursor(
+                cursor, user_id, conversation_key, other_user_id, message_id
+            )
+            if last_read_message_id == message_id:
+                record_read_cursor(cursor, user_id, other_user_id, conversation_key, last_read_message_id)
+            conn.commit()
+
+        # Read receipts for the other participant, cursor sync for the reader's other sessions
+        if last_read_message_id == message_id:
+            for subscriber_id in (other_user_id, user_id):
+                event_bus.publish(subscriber_id, 'read_cursor', {
+                    'conversation_key': conversation_key,
+                    'reader_user_id': user_id,
+                    'last_read_message_id': last_read_message_id
+                })
+
+        return jsonify({
+            'message': 'Conversation marked as read',
+            'conversation_key': conversation_key,
+            'last_read_message_id': last_read_message_id,
+            'newly_read': newly_read
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to mark conversation as read: {str(e)}'
+        }), 500
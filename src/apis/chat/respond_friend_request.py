@@ -6,21 +6,23 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
-from modules.chat.init_friends_db import init_friends_db
-from modules.chat.init_request_db import init_friend_requests_db
 from modules.chat.remove_friendship import remove_friendship
 from modules.chat.get_user_friends import get_user_friends
+from modules.chat.friend_graph import friend_graph, load_friendship_row
+from modules.chat.event_bus import event_bus
+from modules.chat.change_log import record_friend_request
 from modules.chat.get_user_by_username import get_user_by_username
 from modules.chat.add_friendship import add_friendship
 from modules.chat.check_existing_friend_request import check_existing_friend_request
 from modules.chat.check_if_already_friends import check_if_already_friends
 from modules.chat.get_user_by_userid import get_username_by_user_id
+from modules.database.connection_pool import get_db_connection
 
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
@@ -65,64 +67,84 @@ def respond_friend_request_auth(current_user):
 
         friend_user_id = friend_info['user_id']
 
-        conn = sqlite3.connect(FR_REQUESTS_DATABASE)
-        cursor = conn.cursor()
-
-        # Check if the request exists where friend is sender and current user is recipient
-        cursor.execute('''
-            SELECT request_id, sender_user_id, sender_username, recipient_user_id, status
-            FROM friend_requests
-            WHERE sender_user_id = ? AND recipient_user_id = ? AND status IN ('pending', 'rejected')
-        ''', (friend_user_id, user_id))
-
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return jsonify({
-                'error': 'No friend request found from this user (must be pending or previously rejected)'
-            }), 404
-
-        request_id = result[0]
-        sender_username = result[2]
-        current_status = result[4]
-
-        # Check if already accepted
-        if current_status == 'accepted':
-            conn.close()
-            return jsonify({
-                'error': f'You are already friends with {sender_username}'
-            }), 409
-
-        # Update the request status
-        new_status = 'accepted' if action == 'accept' else 'rejected'
-        cursor.execute('''
-            UPDATE friend_requests
-            SET status = ?, timestamp = CURRENT_TIMESTAMP
-            WHERE request_id = ?
-        ''', (new_status, request_id))
-
-        conn.commit()
-        conn.close()
-
-        # Handle friendship database based on action
-        friendship_result = None
-        if action == 'accept':
-            # Add friendship to friends.db - This will make both users friends with each other
-            success, result = add_friendship(user_id, current_user_username, friend_user_id, sender_username)
-            if success:
-                friendship_result = f"Friendship added to database (ID: {result})"
-            else:
-                friendship_result = f"Friendship already exists: {result}"
-        else:  # action == 'reject'
-            # Remove friendship from friends.db (in case it was previously accepted)
-            if remove_friendship(user_id, friend_user_id):
-                friendship_result = "Friendship removed from database"
-            else:
-                friendship_result = "No existing friendship to remove"
+        # Friend requests and friendships share chat.db, so the status change and
+        # the friendship change commit together (one transaction, one commit)
+        with get_db_connection(CHAT_DATABASE) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+
+            # Check if the request exists where friend is sender and current user is recipient
+            cursor.execute('''
+                SELECT request_id, sender_user_id, sender_username, recipient_user_id, status
+                FROM friend_requests
+                WHERE sender_user_id = ? AND recipient_user_id = ? AND status IN ('pending', 'rejected')
+            ''', (friend_user_id, user_id))
+
+            result = cursor.fetchone()
+            if not result:
+                return jsonify({
+                    'error': 'No friend request found from this user (must be pending or previously rejected)'
+                }), 404
+
+            request_id = result[0]
+            sender_username = result[2]
+            current_status = result[4]
+
+            # Check if already accepted
+            if current_status == 'accepted':
+                return jsonify({
+                    'error': f'You are already friends with {sender_username}'
+                }), 409
+
+            # Update the request status
+            new_status = 'accepted' if action == 'accept' else 'rejected'
+            cursor.execute('''
+                UPDATE friend_requests
+                SET status = ?, timestamp = CURRENT_TIMESTAMP
+                WHERE request_id = ?
+            ''', (new_status, request_id))
+
+            record_friend_request(cursor, request_id)
+
+            # Handle friendship based on action
+            friendship_result = None
+            added_row = None
+            removed = False
+            if action == 'accept':
+                # This will make both users friends with each other
+                success, result = add_friendship(user_id, current_user_username, friend_user_id, sender_username, cursor=cursor)
+                if success:
+                    added_row = load_friendship_row(cursor, result)
+                    friendship_result = f"Friendship added to database (ID: {result})"
+                else:
+                    friendship_result = f"Friendship already exists: {result}"
+            else:  # action == 'reject'
+                # Remove friendship (in case it was previously accepted)
+                removed = remove_friendship(user_id, friend_user_id, cursor=cursor)
+                if removed:
+                    friendship_result = "Friendship removed from database"
+                else:
+                    friendship_result = "No existing friendship to remove"
+
+            # Commit and update the in-memory friend graph together
+            with friend_graph.lock:
+                conn.commit()
+                if added_row:
+                    friend_graph.add(added_row)
+                if removed:
+                    friend_graph.remove(user_id, friend_user_id)
+
+        # Tell the original sender how their request was answered
+        event_bus.publish(friend_user_id, 'friend_request_response', {
+            'request_id': request_id,
+            'recipient_user_id': user_id,
+            'recipient_username': current_user_username,
+            'status': new_status
+        })
 
         # Get updated friend counts for both users
-        user_friends_count = len(get_user_friends(user_id))
-        friend_friends_count = len(get_user_friends(friend_user_id))
+        user_friends_count = friend_graph.friend_count(user_id)
+        friend_friends_count = friend_graph.friend_count(friend_user_id)
 
         # Create appropriate response message
         if current_status == 'rejected' and action == 'accept':
@@ -0,0 +1,93 @@
+from flask import Flask, request, jsonify, Blueprint
+import sqlite3
+import requests
+import jwt
+from functools import wraps
+from werkzeug.security import check_password_hash
+from datetime import datetime, timedelta
+from modules.chat.token_verification_and_autorization import token_required
+from modules.database.connection_pool import get_db_connection
+from modules.chat.parse_pagination_args import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from modules.chat.make_conversation_key import make_conversation_key
+from modules.chat.message_search import search_messages as search_message_index
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+USER_API_URL = 'http://localhost:5000'  # User registration API URL
+AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
+JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
+
+search_messages = Blueprint('search_messages', __name__)
+
+
+@search_messages.route('/auth/search_messages', methods=['GET'])
+@token_required
+def search_messages_auth(current_user):
+    """Full-text search over the authenticated user's messages, best match first
+
+    Query parameters: q (required), limit, offset and with_user_id to search
+    a single conversation.
+    """
+    try:
+        user_id = current_user['user_id']
+        query = request.args.get('q', '').strip()
+        with_user_id = request.args.get('with_user_id')
+
+        if not query:
+            return jsonify({
+                'error': 'Search query (q) is required'
+            }), 400
+
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({
+                'error': 'limit and offset must be integers'
+            }), 400
+
+        if limit < 1 or limit > MAX_PAGE_SIZE or offset < 0:
+            return jsonify({
+                'error': f'limit must be between 1 and {MAX_PAGE_SIZE} and offset must not be negative'
+            }), 400
+
+        conversation_key = make_conversation_key(user_id, with_user_id) if with_user_id else None
+
+        with get_db_connection(CHAT_DATABASE) as conn:
+            cursor = conn.cursor()
+
+            try:
+                rows, has_more = search_message_index(cursor, user_id, query, limit, offset, conversation_key)
+            except ValueError as e:
+                return jsonify({
+                    'error': str(e)
+                }), 400
+
+        results = []
+        for row in rows:
+            results.append({
+                'message_id': row[0],
+                'sender': row[1],
+                'recipient': row[2],
+                'message': row[3],
+                'timestamp': row[4],
+                'conversation_key': row[5],
+                'snippet': row[6],
+                'direction': 'sent' if row[1] == user_id else 'received'
+            })
+
+        return jsonify({
+            'query': query,
+            'results': results,
+            'total_results': len(results),
+            'limit': limit,
+            'offset': offset,
+            'has_more': has_more,
+            'next_offset': offset + len(results) if has_more else None
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to search messages: {str(e)}'
+        }), 500
@@ -7,6 +7,8 @@ from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.search_user_by_username import search_user_by_username
+from modules.database.users_database import get_users_db_connection
+from modules.chat.username_index import username_index, DEFAULT_PREFIX_LIMIT, MAX_PREFIX_LIMIT
 
 search_user = Blueprint('search_user', __name__)
 
@@ -56,6 +58,44 @@ def search_user_auth(current_user):
         }), 500
 
 
+@search_user.route('/auth/search_user/prefix', methods=['GET'])
+@token_required
+def search_user_prefix_auth(current_user):
+    """Username typeahead served from the in-memory username index"""
+    try:
+        prefix = request.args.get('q', '')
+
+        if not prefix:
+            return jsonify({
+                'error': 'Prefix (q) is required'
+            }), 400
+
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PREFIX_LIMIT))
+        except ValueError:
+            return jsonify({
+                'error': 'limit must be an integer'
+            }), 400
+
+        if limit < 1 or limit > MAX_PREFIX_LIMIT:
+            return jsonify({
+                'error': f'limit must be between 1 and {MAX_PREFIX_LIMIT}'
+            }), 400
+
+        users = username_index.search_prefix(prefix, limit)
+
+        return jsonify({
+            'prefix': prefix,
+            'users': users,
+            'total_users': len(users)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to search users by prefix: {str(e)}'
+        }), 500
+
+
 @search_user.route('/auth/search_user_by_id', methods=['GET'])
 @token_required
 def search_user_by_id_auth(current_user):
@@ -69,31 +109,10 @@ def search_user_by_id_auth(current_user):
                 'error': 'user_id is required in header'
             }), 400
 
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
-
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    break
-                user_conn.close()
-                user_conn = None
-            except:
-                if user_conn:
-                    user_conn.close()
-                continue
-
-        if not user_conn:
-            return jsonify({'error': 'Could not access users database'}), 500
-
-        cursor = user_conn.cursor()
-        cursor.execute("SELECT user_id, username FROM users WHERE user_id = ?", (search_user_id,))
-        result = cursor.fetchone()
-        user_conn.close()
+        with get_users_db_connection() as user_conn:
+            cursor = user_conn.cursor()
+            cursor.execute("SELECT user_id, username FROM users WHERE user_id = ?", (search_user_id,))
+            result = cursor.fetchone()
 
         if not result:
             return jsonify({
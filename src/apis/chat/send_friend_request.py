@@ -6,8 +6,6 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
-from modules.chat.init_friends_db import init_friends_db
-from modules.chat.init_request_db import init_friend_requests_db
 from modules.chat.remove_friendship import remove_friendship
 from modules.chat.get_user_friends import get_user_friends
 from modules.chat.get_user_by_username import get_user_by_username
@@ -15,12 +13,15 @@ from modules.chat.add_friendship import add_friendship
 from modules.chat.check_existing_friend_request import check_existing_friend_request
 from modules.chat.check_if_already_friends import check_if_already_friends
 from modules.chat.get_user_by_userid import get_username_by_user_id
+from modules.database.connection_pool import get_db_connection
+from modules.chat.event_bus import event_bus
+from modules.chat.change_log import record_friend_request
 
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
@@ -34,9 +35,6 @@ send_friend_request = Blueprint('send_friend_request', __name__)
 def send_friend_request_auth(current_user):
     """Send a friend request using JWT authentication"""
     try:
-        # Initialize database if not exists
-        init_friend_requests_db()
-        
         data = request.get_json()
         if not data or 'username' not in data:
             return jsonify({
@@ -90,18 +88,39 @@ def send_friend_request_auth(current_user):
         }
 
         # Store friend request in database
-        conn = sqlite3.connect(FR_REQUESTS_DATABASE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO friend_requests 
-            (sender_user_id, sender_username, recipient_user_id, recipient_username, request_data, status)
-            VALUES (?, ?, ?, ?, ?, 'pending')
-        ''', (sender_user_id, sender_username, recipient_user_id, recipient_username, str(friend_request_data)))
-
-        request_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with get_db_connection(FR_REQUESTS_DATABASE) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+
+            # Re-sending reuses the row (and request_id) of an earlier request in the
+            # same direction, so clients syncing by request_id never see it vanish
+            cursor.execute('''
+                INSERT INTO friend_requests
+                (sender_user_id, sender_username, recipient_user_id, recipient_username, request_data, status)
+                VALUES (?, ?, ?, ?, ?, 'pending')
+                ON CONFLICT (sender_user_id, recipient_user_id) DO UPDATE SET
+                    sender_username = excluded.sender_username,
+                    recipient_username = excluded.recipient_username,
+                    request_data = excluded.request_data,
+                    status = 'pending',
+                    timestamp = CURRENT_TIMESTAMP
+            ''', (sender_user_id, sender_username, recipient_user_id, recipient_username, str(friend_request_data)))
+
+            cursor.execute('''
+                SELECT request_id FROM friend_requests
+                WHERE sender_user_id = ? AND recipient_user_id = ?
+            ''', (sender_user_id, recipient_user_id))
+            request_id = cursor.fetchone()[0]
+
+            record_friend_request(cursor, request_id)
+            conn.commit()
+
+        event_bus.publish(recipient_user_id, 'friend_request', {
+            'request_id': request_id,
+            'sender_user_id': sender_user_id,
+            'sender_username': sender_username,
+            'status': 'pending'
+        })
 
         return jsonify({
             'message': 'Friend request sent successfully',
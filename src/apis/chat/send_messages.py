@@ -7,6 +7,9 @@ from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.check_user_exist_from_db import check_user_exists
 from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.make_conversation_key import make_conversation_key
+from modules.chat.message_writer import message_writer, MessageOutcomeUnknown, ClientMessageIdReused
+from modules.chat.event_bus import event_bus
 
 
 send_messages=Blueprint('send_messages',__name__)
@@ -16,6 +19,7 @@ CHAT_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
+MAX_CLIENT_MESSAGE_ID_LENGTH = 128
 
 
 
@@ -34,6 +38,14 @@ def send_message_auth(current_user):
         recipient_user_id = data['recipient_user_id']
         sender_user_id = current_user['user_id']
 
+        # Optional idempotency key: a retry with the same key returns the first message
+        client_message_id = request.headers.get('Idempotency-Key', data.get('client_message_id'))
+        if client_message_id is not None and (not isinstance(client_message_id, str)
+                                              or not 0 < len(client_message_id) <= MAX_CLIENT_MESSAGE_ID_LENGTH):
+            return jsonify({
+                'error': f'client_message_id must be a string of 1 to {MAX_CLIENT_MESSAGE_ID_LENGTH} characters'
+            }), 400
+
         # Check if recipient exists
         if not check_user_exists(recipient_user_id):
             return jsonify({
@@ -46,26 +58,46 @@ def send_message_auth(current_user):
                 'error': 'Cannot send message to yourself'
             }), 400
 
-        # Store message in chat database
-        conn = sqlite3.connect(CHAT_DATABASE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO messages (sender_user_id, recipient_user_id, message)
-            VALUES (?, ?, ?)
-        ''', (sender_user_id, recipient_user_id, message))
+        # Store message in chat database (the writer thread commits messages in batches)
+        conversation_key = make_conversation_key(sender_user_id, recipient_user_id)
+        # A replayed key returns the stored row: same recipient and text, its original timestamp
+        message_id, timestamp, created = message_writer.send(sender_user_id, recipient_user_id, message, conversation_key, client_message_id)
 
-        message_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        # Push to the recipient's streams/long-polls and the sender's other sessions
+        # (a replayed idempotent send was already pushed the first time)
+        if created:
+            for user_id, direction in ((recipient_user_id, 'received'), (sender_user_id, 'sent')):
+                event_bus.publish(user_id, 'message', {
+                    'message_id': message_id,
+                    'sender': sender_user_id,
+                    'recipient': recipient_user_id,
+                    'message': message,
+                    'timestamp': timestamp,
+                    'is_read': False,
+                    'direction': direction
+                })
 
         return jsonify({
-            'message': 'Message sent successfully',
+            'message': 'Message sent successfully' if created else 'Message already sent',
             'message_id': message_id,
             'sender': sender_user_id,
             'recipient': recipient_user_id,
-            'timestamp': datetime.now().isoformat()
-        }), 201
+            'timestamp': timestamp
+        }), 201 if created else 200
+
+    except ClientMessageIdReused as e:
+        return jsonify({
+            'error': str(e),
+            'client_message_id': client_message_id
+        }), 409
+
+    except MessageOutcomeUnknown as e:
+        # Not a failure: the write may still commit, so a blind retry could duplicate it
+        return jsonify({
+            'error': f'{str(e)}. Retry with the same Idempotency-Key to get the stored message without sending it twice',
+            'outcome': 'unknown',
+            'client_message_id': client_message_id
+        }), 503, {'Retry-After': '1'}
 
     except Exception as e:
         return jsonify({
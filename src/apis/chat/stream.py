@@ -0,0 +1,70 @@
+from flask import Flask, request, jsonify, Blueprint, Response
+import json
+import sqlite3
+import requests
+import jwt
+from functools import wraps
+from werkzeug.security import check_password_hash
+from datetime import datetime, timedelta
+from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.event_bus import event_bus
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+USER_API_URL = 'http://localhost:5000'  # User registration API URL
+AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
+JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
+HEARTBEAT_SECONDS = 15  # Comment line sent on idle streams so proxies keep them open
+RETRY_MILLISECONDS = 3000  # Reconnect delay suggested to EventSource clients
+
+stream = Blueprint('stream', __name__)
+
+
+def format_sse(sequence, event_type, data):
+    """Serialize one event in text/event-stream format"""
+    return f'id: {sequence}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n'
+
+
+@stream.route('/auth/stream', methods=['GET'])
+@token_required
+def stream_events_auth(current_user):
+    """Server-Sent Events stream of the user's messages, read receipts and friend requests
+
+    Event types: message, message_read, message_deleted, read_cursor,
+    friend_request, friend_request_response. Reconnecting clients send
+    Last-Event-ID to resume from the events kept in memory; when those no
+    longer cover the gap they get resync_required, whose sync_url
+    (/auth/sync) returns everything they missed.
+    """
+    user_id = current_user['user_id']
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        after_sequence = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({
+            'error': 'Last-Event-ID must be an integer'
+        }), 400
+
+    def generate():
+        # Subscribed for the life of the stream, so events between waits stay buffered
+        with event_bus.subscription(user_id):
+            sequence = after_sequence if after_sequence is not None else event_bus.current_sequence()
+            yield f'retry: {RETRY_MILLISECONDS}\n: connected\n\n'
+
+            while True:
+                events = event_bus.wait(user_id, sequence, HEARTBEAT_SECONDS)
+                if not events:
+                    # Also lets the server notice clients that went away
+                    yield ': keepalive\n\n'
+                    continue
+
+                for event_sequence, event_type, data in events:
+                    sequence = event_sequence
+                    yield format_sse(event_sequence, event_type, data)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
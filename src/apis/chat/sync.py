@@ -0,0 +1,79 @@
+from flask import Flask, request, jsonify, Blueprint
+from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.change_log import fetch_changes, change_log_horizon, latest_change_id
+from modules.database.connection_pool import get_db_connection
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+SYNC_RESYNC_URLS = ['/auth/messages', '/auth/get_friends', '/auth/get_friend_requests']  # Full state after a resync
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 1000
+
+
+sync = Blueprint('sync', __name__)
+
+
+@sync.route('/auth/sync', methods=['GET'])
+@token_required
+def sync_auth(current_user):
+    """Changes to the user's messages, read cursors, friend requests and friends since a cursor
+
+    Query parameters: since (the next_cursor of the previous sync, 0 for
+    everything) and limit. Changes come oldest first; a 'delete' operation
+    is a tombstone for something the client should drop. Keep calling with
+    next_cursor while has_more is true.
+
+    If since is older than the compacted part of the log, the answer has
+    resync_required set and no changes: the client reloads its state from
+    the regular list endpoints, then syncs on from the next_cursor given.
+    """
+    try:
+        user_id = current_user['user_id']
+
+        try:
+            since = int(request.args.get('since', 0))
+            limit = int(request.args.get('limit', DEFAULT_SYNC_LIMIT))
+        except ValueError:
+            return jsonify({
+                'error': 'since and limit must be integers'
+            }), 400
+
+        if since < 0:
+            return jsonify({
+                'error': 'since must not be negative'
+            }), 400
+        if limit < 1 or limit > MAX_SYNC_LIMIT:
+            return jsonify({
+                'error': f'limit must be between 1 and {MAX_SYNC_LIMIT}'
+            }), 400
+
+        with get_db_connection(CHAT_DATABASE) as conn:
+            cursor = conn.cursor()
+            # One read snapshot, so the horizon and the changes agree
+            conn.execute('BEGIN')
+            horizon = change_log_horizon(cursor)
+            if since < horizon:
+                return jsonify({
+                    'changes': [],
+                    'total_changes': 0,
+                    'has_more': False,
+                    'next_cursor': max(latest_change_id(cursor, user_id), horizon),
+                    'resync_required': True,
+                    'resync_urls': SYNC_RESYNC_URLS
+                }), 200
+
+            changes, has_more = fetch_changes(cursor, user_id, since, limit)
+
+        return jsonify({
+            'changes': changes,
+            'total_changes': len(changes),
+            'has_more': has_more,
+            'next_cursor': changes[-1]['change_id'] if changes else since,
+            'resync_required': False
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to sync: {str(e)}'
+        }), 500
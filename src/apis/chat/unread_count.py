@@ -0,0 +1,33 @@
+from flask import Flask, request, jsonify, Blueprint
+from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.message_counters import get_unread_counts
+from modules.database.connection_pool import get_db_connection
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+
+
+unread_count=Blueprint('unread_count',__name__)
+
+
+@unread_count.route('/auth/unread_count', methods=['GET'])
+@token_required
+def get_unread_count_auth(current_user):
+    """Get unread message totals for the authenticated user, overall and per conversation"""
+    try:
+        user_id = current_user['user_id']
+
+        with get_db_connection(CHAT_DATABASE) as conn:
+            total_unread, conversations = get_unread_counts(conn.cursor(), user_id)
+
+        return jsonify({
+            'user_id': user_id,
+            'total_unread': total_unread,
+            'conversations': conversations
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to fetch unread count: {str(e)}'
+        }), 500
@@ -4,6 +4,10 @@ import os
 from werkzeug.security import generate_password_hash
 from modules.registration.automatically_make_user_id import get_next_user_id
 from modules.registration.init_db import init_db
+from modules.database.connection_pool import get_db_connection
+from modules.database.users_database import get_users_version
+from modules.http.conditional_get import conditional_get
+from modules.http.streaming_json import stream_collection
 
 
 # Database configuration
@@ -14,32 +18,21 @@ get_whole_users=Blueprint('get_whole_users',__name__)
 
 
 @get_whole_users.route('/users', methods=['GET'])
+@conditional_get(lambda: get_users_version(DATABASE))
 def get_all_users():
-    """Get all registered users (for testing purposes)"""
+    """Get all registered users (for testing purposes), streamed as JSON or NDJSON"""
     try:
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        query = '''
             SELECT user_id, username, created_at
             FROM users
             ORDER BY id ASC
-        ''')
-
-        users = []
-        for row in cursor.fetchall():
-            users.append({
-                'user_id': row[0],
-                'username': row[1],
-                'created_at': row[2]
-            })
+        '''
 
-        conn.close()
-
-        return jsonify({
-            'users': users,
-            'total_users': len(users)
-        }), 200
+        return stream_collection(DATABASE, query, lambda row: {
+            'user_id': row[0],
+            'username': row[1],
+            'created_at': row[2]
+        }, 'users', 'total_users')
 
     except Exception as e:
         return jsonify({
@@ -4,6 +4,9 @@ import os
 from werkzeug.security import generate_password_hash
 from modules.registration.automatically_make_user_id import get_next_user_id
 from modules.registration.init_db import init_db
+from modules.database.connection_pool import get_db_connection
+from modules.http.conditional_get import conditional_get
+from modules.database.users_database import get_user_version
 
 
 # Database configuration
@@ -13,20 +16,21 @@ get_specific_user=Blueprint('get_specific_user',__name__)
 
 
 @get_specific_user.route('/user/<user_id>', methods=['GET'])
+# Versioned by the row itself; an unknown user_id gets no ETag and a 404, never a 304
+@conditional_get(lambda user_id: get_user_version(user_id, DATABASE))
 def get_user(user_id):
     """Get specific user by user_id"""
     try:
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(DATABASE) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT user_id, username, created_at
-            FROM users
-            WHERE user_id = ?
-        ''', (user_id,))
+            cursor.execute('''
+                SELECT user_id, username, created_at
+                FROM users
+                WHERE user_id = ?
+            ''', (user_id,))
 
-        user = cursor.fetchone()
-        conn.close()
+            user = cursor.fetchone()
 
         if user:
             return jsonify({
@@ -4,6 +4,9 @@ import os
 from werkzeug.security import generate_password_hash
 from modules.registration.automatically_make_user_id import get_next_user_id
 from modules.registration.init_db import init_db
+from modules.database.connection_pool import get_db_connection
+from modules.chat.user_directory import invalidate_user_directory
+from modules.auth_app.password_hashing_pool import password_hashing_pool, PasswordHashingBusy
 
 
 # Database configuration
@@ -28,28 +31,33 @@ def register_user():
             }), 400
 
         # Check if username already exists
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
+        with get_db_connection(DATABASE) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT username FROM users WHERE username = ?", (username,))
-        if cursor.fetchone():
-            conn.close()
-            return jsonify({
-                'error': 'Username already exists'
-            }), 409
+            cursor.execute("SELECT username FROM users WHERE username = ?", (username,))
+            if cursor.fetchone():
+                return jsonify({
+                    'error': 'Username already exists'
+                }), 409
+
+        # Hash the password on the hashing pool without holding a connection
+        password_hash = password_hashing_pool.hash_password(password)
+
+        with get_db_connection(DATABASE) as conn:
+            cursor = conn.cursor()
 
-        # Generate user ID and hash password
-        user_id = get_next_user_id()
-        password_hash = generate_password_hash(password)
+            # Generate user ID
+            user_id = get_next_user_id()
 
-        # Insert new user
-        cursor.execute('''
-            INSERT INTO users (user_id, username, password_hash)
-            VALUES (?, ?, ?)
-        ''', (user_id, username, password_hash))
+            # Insert new user
+            cursor.execute('''
+                INSERT INTO users (user_id, username, password_hash)
+                VALUES (?, ?, ?)
+            ''', (user_id, username, password_hash))
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+
+        invalidate_user_directory(user_id, username)
 
         return jsonify({
             'message': 'User registered successfully',
@@ -57,6 +65,11 @@ def register_user():
             'username': username
         }), 201
 
+    except PasswordHashingBusy as e:
+        return jsonify({
+            'error': str(e)
+        }), 503, {'Retry-After': '1'}
+
     except Exception as e:
         return jsonify({
             'error': f'Registration failed: {str(e)}'
@@ -8,8 +8,14 @@ from modules.auth_app.get_user_from_db import get_user_from_database
 from modules.auth_app.token_reguired import token_required
 from modules.auth_app.verify_user_credentials import verify_user_credentials
 from apis.auth_app.login_jwt import login_jwt
+from modules.database.users_database import resolve_users_database, get_users_db_connection
+from modules.database.migrations import run_migrations
+from modules.registration.init_db import USERS_MIGRATIONS
+from modules.http.streaming_json import stream_collection
+from modules.http.response_layer import install_response_layer
 
 app = Flask(__name__)
+install_response_layer(app)
 
 app.register_blueprint(login_jwt)
 
@@ -21,44 +27,30 @@ app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
 def debug_users():
     """Debug endpoint to list all users"""
     try:
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
+        query = "SELECT user_id, username FROM users"
 
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    cursor.execute("SELECT user_id, username FROM users")
-                    users = cursor.fetchall()
-                    user_conn.close()
-                    
-                    return jsonify({
-                        'database_path': path,
-                        'users': [{'user_id': u[0], 'username': u[1]} for u in users]
-                    }), 200
-                    
-                user_conn.close()
-            except Exception as e:
-                if user_conn:
-                    user_conn.close()
-                continue
-
-        return jsonify({'error': 'Could not find users database'}), 404
+        return stream_collection(resolve_users_database(), query, lambda u: {'user_id': u[0], 'username': u[1]}, 'users', envelope={
+            'database_path': resolve_users_database()
+        })
 
     except Exception as e:
         return jsonify({'error': f'Debug failed: {str(e)}'}), 500
 
 if __name__ == '__main__':
+    # Fail fast if the users database is missing instead of on the first login
+    resolve_users_database()
+
+    # Make sure the refresh_tokens table exists even if registration hasn't restarted yet
+    run_migrations(resolve_users_database(), USERS_MIGRATIONS)
+
     print("Flask JWT Authentication App - Database Integrated")
     print("=" * 50)
     print("Available endpoints:")
     print("- POST /login - Login to get JWT token")
     print("- GET /verify-token - Verify token validity")
     print("- GET /protected - Protected route example")
-    print("- POST /refresh-token - Refresh your token")
+    print("- POST /refresh - Exchange a refresh token for a new access token")
+    print("- POST /revoke - Revoke a refresh token (logout)")
     print("- GET /user/<user_id> - Get user information")
     print("- POST /validate-user - Validate credentials")
     print("- GET /debug/users - List all users (debug)")
@@ -10,8 +10,6 @@ from modules.chat.token_verification_and_autorization import token_required
 from modules.chat.users_credentials_verification_from_db import verify_user_credentials
 from modules.chat.check_user_exist_from_db import check_user_exists
 from modules.chat.token_verification_and_autorization import token_required
-from modules.chat.init_friends_db import init_friends_db
-from modules.chat.init_request_db import init_friend_requests_db
 from modules.chat.remove_friendship import remove_friendship
 from modules.chat.get_user_friends import get_user_friends
 from modules.chat.get_user_by_username import get_user_by_username
@@ -30,6 +28,21 @@ from apis.chat.send_friend_request import send_friend_request
 from apis.chat.get_friend_requests import get_friend_requests
 from apis.chat.get_friends import get_friends
 from apis.chat.respond_friend_request import respond_friend_request
+from apis.chat.unread_count import unread_count
+from apis.chat.search_messages import search_messages
+from apis.chat.friend_suggestions import friend_suggestions
+from apis.chat.stream import stream
+from apis.chat.sync import sync
+from modules.database.connection_pool import get_db_connection
+from modules.database.users_database import resolve_users_database
+from modules.chat.message_counters import get_chat_counters
+from modules.chat.message_writer import message_writer
+from modules.chat.message_archive import message_archiver
+from modules.chat.change_log import change_log_compactor
+from modules.chat.username_index import username_index
+from modules.chat.user_directory import user_directory
+from modules.chat.friend_graph import friend_graph
+from modules.http.response_layer import install_response_layer
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
@@ -40,6 +53,7 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 # Blueprints
 
 app = Flask(__name__)
+install_response_layer(app)
 
 app.register_blueprint(send_messages)
 app.register_blueprint(get_messages)
@@ -52,6 +66,11 @@ app.register_blueprint(send_friend_request)
 app.register_blueprint(get_friend_requests)
 app.register_blueprint(get_friends)
 app.register_blueprint(respond_friend_request)
+app.register_blueprint(unread_count)
+app.register_blueprint(search_messages)
+app.register_blueprint(friend_suggestions)
+app.register_blueprint(stream)
+app.register_blueprint(sync)
 
 
 # Utility endpoints
@@ -69,32 +88,16 @@ def health_check():
 def get_stats():
     """Get basic statistics about the chat system"""
     try:
-        conn = sqlite3.connect(CHAT_DATABASE)
-        cursor = conn.cursor()
-
-        # Get total messages
-        cursor.execute('SELECT COUNT(*) FROM messages')
-        total_messages = cursor.fetchone()[0]
-
-        # Get total unread messages
-        cursor.execute('SELECT COUNT(*) FROM messages WHERE is_read = FALSE')
-        unread_messages = cursor.fetchone()[0]
-
-        # Get unique users who have sent messages
-        cursor.execute('SELECT COUNT(DISTINCT sender_user_id) FROM messages')
-        active_senders = cursor.fetchone()[0]
-
-        # Get unique users who have received messages
-        cursor.execute('SELECT COUNT(DISTINCT recipient_user_id) FROM messages')
-        active_recipients = cursor.fetchone()[0]
-
-        conn.close()
+        # Counters are maintained by send/delete/mark-read, so this never scans messages
+        with get_db_connection(CHAT_DATABASE) as conn:
+            counters = get_chat_counters(conn.cursor())
 
         return jsonify({
-            'total_messages': total_messages,
-            'unread_messages': unread_messages,
-            'active_senders': active_senders,
-            'active_recipients': active_recipients,
+            'total_messages': counters['total_messages'],
+            'unread_messages': counters['unread_messages'],
+            'active_senders': counters['active_senders'],
+            'active_recipients': counters['active_recipients'],
+            'user_directory_cache': user_directory.stats(),
             'timestamp': datetime.now().isoformat()
         }), 200
 
@@ -125,9 +128,25 @@ def internal_error(error):
 
 # Initialize database and run the application
 if __name__ == '__main__':
-    # Initialize the chat database
+    # Fail fast if the users database is missing instead of on the first request
+    resolve_users_database()
+
+    # Initialize the chat database (messages, friends and friend requests)
     init_chat_db()
     print("Chat database initialized successfully!")
+
+    # In-memory username index for typeahead and friend graph
+    username_index.load()
+    friend_graph.load()
+
+    # Single writer thread for message inserts
+    message_writer.start()
+
+    # Move old messages out of chat.db into monthly archive files
+    message_archiver.start()
+
+    # Prune and collapse the sync change log so it doesn't keep every message body forever
+    change_log_compactor.start()
     
     # Run the Flask application
     print("Starting Chat API server...")
@@ -135,8 +154,17 @@ if __name__ == '__main__':
     print("  POST /login - Authenticate and get JWT token")
     print("  POST /auth/send_message - Send message (JWT auth)")
     print("  GET /auth/messages - Get user messages (JWT auth)")
+    print("  GET /auth/messages/wait?after_id= - Long-poll for new messages (JWT auth)")
+    print("  GET /auth/stream - Server-Sent Events for messages and friend requests (JWT auth)")
+    print("  GET /auth/sync?since=<cursor> - Changes since the last sync (JWT auth)")
     print("  GET /auth/conversation/<user_id> - Get conversation (JWT auth)")
     print("  PUT /auth/mark_read/<message_id> - Mark message as read (JWT auth)")
+    print("  PUT /auth/conversation/<user_id>/read_up_to/<message_id> - Mark conversation read (JWT auth)")
+    print("  GET /auth/unread_count - Unread totals per user and conversation (JWT auth)")
+    print("  GET /auth/search_messages?q= - Full-text search over your messages (JWT auth)")
+    print("  GET /auth/search_user/prefix?q= - Username typeahead (JWT auth)")
+    print("  GET /auth/friend_suggestions - Friends of friends by mutual friends (JWT auth)")
+    print("  GET /auth/mutual_friends/<user_id> - Mutual friends with a user (JWT auth)")
     print("  GET /auth/users - Get all users (JWT auth)")
     print("  DELETE /auth/delete_message/<message_id> - Delete message (JWT auth)")
     print("  GET /health - Health check")
@@ -0,0 +1,69 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+# Configuration
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))  # 0 hashes inline
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', max(PASSWORD_HASH_WORKERS, 1) * 4))
+PASSWORD_HASH_QUEUE_WAIT = 2.0  # Seconds a request waits for a free slot before getting a 503
+PASSWORD_HASH_TIMEOUT = 30  # Seconds a request waits for its hash once queued
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when too many hash/verify jobs are already queued, or a queued one takes too long"""
+
+
+class PasswordHashingPool:
+    """Runs PBKDF2/scrypt hashing on worker processes with a bounded queue
+
+    Request threads only wait on a future, so the GIL stays free for other
+    requests while passwords are hashed, and throughput scales with cores.
+    At most max_pending jobs are in flight; further callers wait briefly
+    for a slot and then get PasswordHashingBusy (backpressure).
+    """
+
+    def __init__(self, workers=PASSWORD_HASH_WORKERS, max_pending=PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._start_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._start_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        if not self._slots.acquire(timeout=PASSWORD_HASH_QUEUE_WAIT):
+            raise PasswordHashingBusy('Password hashing queue is full, try again shortly')
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+        except FutureTimeoutError:
+            # A slow pool is not a wrong password; callers answer 503 for both
+            raise PasswordHashingBusy('Password hashing timed out, try again shortly')
+
+    def hash_password(self, password):
+        """generate_password_hash on a worker process"""
+        return self._run(generate_password_hash, password)
+
+    def check_password(self, password_hash, password):
+        """check_password_hash on a worker process"""
+        return self._run(check_password_hash, password_hash, password)
+
+
+# Shared pool for registration and login
+password_hashing_pool = PasswordHashingPool()
@@ -0,0 +1,112 @@
+import hashlib
+import secrets
+import jwt
+from datetime import datetime, timedelta
+from modules.database.users_database import get_users_db_connection
+
+
+# Configuration
+JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match chat.py
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=15)
+REFRESH_TOKEN_LIFETIME = timedelta(days=30)
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'  # Same format as SQLite CURRENT_TIMESTAMP (UTC)
+
+
+def hash_refresh_token(refresh_token):
+    """sha256 hex digest stored instead of the refresh token itself"""
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def issue_access_token(user_id, username):
+    """Create a short-lived HS256 access token"""
+    return jwt.encode({
+        'user_id': user_id,
+        'username': username,
+        'exp': datetime.utcnow() + ACCESS_TOKEN_LIFETIME
+    }, JWT_SECRET_KEY, algorithm='HS256')
+
+
+def _store_refresh_token(cursor, user_id, username):
+    now = datetime.utcnow()
+
+    # Revoked and expired tokens can never be used again; drop the user's on every issue
+    cursor.execute('''
+        DELETE FROM refresh_tokens
+        WHERE user_id = ? AND (revoked_at IS NOT NULL OR expires_at <= ?)
+    ''', (user_id, now.strftime(TIMESTAMP_FORMAT)))
+
+    refresh_token = secrets.token_urlsafe(32)
+    expires_at = (now + REFRESH_TOKEN_LIFETIME).strftime(TIMESTAMP_FORMAT)
+    cursor.execute('''
+        INSERT INTO refresh_tokens (token_hash, user_id, username, expires_at)
+        VALUES (?, ?, ?, ?)
+    ''', (hash_refresh_token(refresh_token), user_id, username, expires_at))
+    return refresh_token
+
+
+def issue_refresh_token(user_id, username):
+    """Create and store a long-lived opaque refresh token, pruning the user's dead ones"""
+    with get_users_db_connection() as user_conn:
+        refresh_token = _store_refresh_token(user_conn.cursor(), user_id, username)
+        user_conn.commit()
+
+    return refresh_token
+
+
+def rotate_refresh_token(refresh_token):
+    """Exchange a valid refresh token for a new one
+
+    The old token is revoked in the same transaction, so each refresh token
+    works once. Returns (user_id, username, new_refresh_token), or None if
+    the token is unknown, expired or revoked.
+    """
+    now = datetime.utcnow().strftime(TIMESTAMP_FORMAT)
+
+    with get_users_db_connection() as user_conn:
+        user_conn.execute('BEGIN IMMEDIATE')
+        cursor = user_conn.cursor()
+        cursor.execute('''
+            UPDATE refresh_tokens SET revoked_at = ?
+            WHERE token_hash = ? AND revoked_at IS NULL AND expires_at > ?
+        ''', (now, hash_refresh_token(refresh_token), now))
+
+        if cursor.rowcount == 0:
+            user_conn.rollback()
+            return None
+
+        cursor.execute('''
+            SELECT user_id, username FROM refresh_tokens WHERE token_hash = ?
+        ''', (hash_refresh_token(refresh_token),))
+        user_id, username = cursor.fetchone()
+
+        new_refresh_token = _store_refresh_token(cursor, user_id, username)
+        user_conn.commit()
+
+    return user_id, username, new_refresh_token
+
+
+def revoke_refresh_token(refresh_token, all_sessions=False):
+    """Revoke a refresh token, or every token of its user when all_sessions is set
+
+    Revoked tokens are deleted outright, as nothing reads them again.
+    Returns the number of tokens revoked.
+    """
+    token_hash = hash_refresh_token(refresh_token)
+
+    with get_users_db_connection() as user_conn:
+        cursor = user_conn.cursor()
+        if all_sessions:
+            cursor.execute('''
+                DELETE FROM refresh_tokens
+                WHERE revoked_at IS NULL
+                  AND user_id = (SELECT user_id FROM refresh_tokens WHERE token_hash = ?)
+            ''', (token_hash,))
+        else:
+            cursor.execute('''
+                DELETE FROM refresh_tokens
+                WHERE token_hash = ? AND revoked_at IS NULL
+            ''', (token_hash,))
+        revoked = cursor.rowcount
+        user_conn.commit()
+
+    return revoked
@@ -4,12 +4,16 @@ import datetime
 from functools import wraps
 import sqlite3
 from werkzeug.security import check_password_hash
+from modules.auth_app.verified_token_cache import VerifiedTokenCache
 
 app = Flask(__name__)
 
 # Secret key for JWT encoding/decoding (in production, use environment variable)
 app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
 
+verified_tokens = VerifiedTokenCache()
+
+
 def token_required(f):
     """Decorator to verify JWT token"""
     @wraps(f)
@@ -24,7 +28,11 @@ def token_required(f):
             if token.startswith('Bearer '):
                 token = token[7:]
 
-            data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+            # Skip the base64/JSON/HMAC work for tokens this process already verified
+            data = verified_tokens.get(token)
+            if data is None:
+                data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+                verified_tokens.put(token, data)
             current_user = {
                 'user_id': data['user_id'],
                 'username': data['username']
@@ -0,0 +1,48 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+# Configuration
+VERIFIED_TOKEN_CACHE_SIZE = 10000  # Distinct tokens remembered per decorator
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of JWTs that already passed jwt.decode, keyed by sha256 of the raw token
+
+    An entry is only used while time.time() < exp, the same rule jwt.decode
+    applies, so a cached token expires at exactly the same moment. Tokens
+    without a numeric exp claim are never cached.
+    """
+
+    def __init__(self, max_entries=VERIFIED_TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # sha256 digest -> (exp, claims)
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """Get the cached claims for a token, or None if it must be decoded"""
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, token, claims):
+        """Remember the claims of a token that jwt.decode accepted"""
+        exp = claims.get('exp')
+        if not isinstance(exp, (int, float)):
+            return
+
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[key] = (exp, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
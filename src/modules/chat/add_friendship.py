@@ -6,53 +6,71 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
-from modules.chat.init_friends_db import init_friends_db
+from modules.database.connection_pool import get_db_connection
+from modules.chat.friend_graph import friend_graph, load_friendship_row
+from modules.chat.change_log import record_friendship
 
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
 
 
 
-def add_friendship(user1_id, user1_username, user2_id, user2_username):
-    """Add friendship to friends database"""
-    try:
-        init_friends_db()
-        conn = sqlite3.connect(FRIENDS_DATABASE)
-        cursor = conn.cursor()
+def _insert_friendship(cursor, user1_id, user1_username, user2_id, user2_username):
+    # Check if friendship already exists (in either direction)
+    cursor.execute('''
+        SELECT friendship_id FROM friends
+        WHERE (user1_id = ? AND user2_id = ?) OR (user1_id = ? AND user2_id = ?)
+    ''', (user1_id, user2_id, user2_id, user1_id))
+
+    if cursor.fetchone():
+        return False, "Friendship already exists"
 
-        # Check if friendship already exists (in either direction)
+    # Add friendship (always store in alphabetical order by user_id for consistency)
+    if user1_id < user2_id:
+        cursor.execute('''
+            INSERT INTO friends (user1_id, user1_username, user2_id, user2_username)
+            VALUES (?, ?, ?, ?)
+        ''', (user1_id, user1_username, user2_id, user2_username))
+    else:
         cursor.execute('''
-            SELECT friendship_id FROM friends
-            WHERE (user1_id = ? AND user2_id = ?) OR (user1_id = ? AND user2_id = ?)
-        ''', (user1_id, user2_id, user2_id, user1_id))
-
-        if cursor.fetchone():
-            conn.close()
-            return False, "Friendship already exists"
-
-        # Add friendship (always store in alphabetical order by user_id for consistency)
-        if user1_id < user2_id:
-            cursor.execute('''
-                INSERT INTO friends (user1_id, user1_username, user2_id, user2_username)
-                VALUES (?, ?, ?, ?)
-            ''', (user1_id, user1_username, user2_id, user2_username))
-        else:
-            cursor.execute('''
-                INSERT INTO friends (user1_id, user1_username, user2_id, user2_username)
-                VALUES (?, ?, ?, ?)
-            ''', (user2_id, user2_username, user1_id, user1_username))
-
-        friendship_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-
-        return True, friendship_id
+            INSERT INTO friends (user1_id, user1_username, user2_id, user2_username)
+            VALUES (?, ?, ?, ?)
+        ''', (user2_id, user2_username, user1_id, user1_username))
+
+    friendship_id = cursor.lastrowid
+    record_friendship(cursor, load_friendship_row(cursor, friendship_id))
+    return True, friendship_id
+
+
+def add_friendship(user1_id, user1_username, user2_id, user2_username, cursor=None):
+    """Add friendship to friends database
+
+    When a cursor is given the insert joins the caller's transaction; the
+    caller commits and then adds the row to friend_graph. Errors are raised
+    instead of returned.
+    """
+    if cursor is not None:
+        return _insert_friendship(cursor, user1_id, user1_username, user2_id, user2_username)
+
+    try:
+        with get_db_connection(FRIENDS_DATABASE) as conn:
+            cursor = conn.cursor()
+            result = _insert_friendship(cursor, user1_id, user1_username, user2_id, user2_username)
+            row = load_friendship_row(cursor, result[1]) if result[0] else None
+
+            # Commit and update the graph together so the graph follows commit order
+            with friend_graph.lock:
+                conn.commit()
+                if row:
+                    friend_graph.add(row)
+
+        return result
 
     except Exception as e:
         print(f"Error adding friendship: {e}")
@@ -0,0 +1,283 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from modules.database.connection_pool import get_db_connection
+
+
+# Append-only log of per-user changes in chat.db, read by /auth/sync. Every
+# function takes the cursor of the caller's write transaction so a change is
+# logged if and only if the mutation that caused it commits.
+#
+# Each row is one change seen by one user:
+#   entity     'message', 'read_cursor', 'friend_request' or 'friend'
+#   entity_id  message_id, "<conversation_key>/<reader_user_id>", request_id or the friend's user_id
+#   operation  'upsert' (data is the full object), 'update' (data holds the
+#              changed fields) or 'delete' (tombstone, data is NULL)
+#
+# The compactor keeps the log small: rows older than CHANGE_LOG_RETENTION_DAYS
+# are pruned (moving the horizon), and rows superseded by a later upsert or
+# delete of the same entity are collapsed away.
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('CHAT_CHANGE_LOG_RETENTION_DAYS', '30'))  # Older changes are pruned
+COMPACT_BATCH_SIZE = 1000  # change_ids examined per write transaction
+COMPACT_INTERVAL_SECONDS = 3600  # How often the background compactor runs
+
+MESSAGE_FIELDS = ('message_id', 'sender', 'recipient', 'message', 'timestamp', 'is_read')
+
+
+def record_change(cursor, user_ids, entity, entity_id, operation, data=None):
+    """Append one change for each of user_ids"""
+    payload = json.dumps(data) if data is not None else None
+    cursor.executemany('''
+        INSERT INTO change_log (user_id, entity, entity_id, operation, data)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(user_id, entity, str(entity_id), operation, payload) for user_id in user_ids])
+
+
+def record_message_created(cursor, message_id):
+    """Log a newly inserted message for its sender and recipient"""
+    cursor.execute('''
+        SELECT id, sender_user_id, recipient_user_id, message, timestamp, is_read
+        FROM messages WHERE id = ?
+    ''', (message_id,))
+    message = dict(zip(MESSAGE_FIELDS, cursor.fetchone()))
+    message['is_read'] = bool(message['is_read'])
+
+    record_change(cursor, [message['sender']], 'message', message_id, 'upsert', dict(message, direction='sent'))
+    record_change(cursor, [message['recipient']], 'message', message_id, 'upsert', dict(message, direction='received'))
+
+
+def record_message_read(cursor, sender_user_id, recipient_user_id, message_id):
+    """Log a message flipped to read for both participants"""
+    record_change(cursor, [sender_user_id, recipient_user_id], 'message', message_id, 'update', {
+        'message_id': int(message_id),
+        'is_read': True
+    })
+
+
+def record_message_removed(cursor, sender_user_id, recipient_user_id, message_id):
+    """Log a tombstone for a deleted message for both participants
+
+    The message's earlier changes are deleted first, so its text is not
+    left readable through /auth/sync.
+    """
+    cursor.execute('''
+        DELETE FROM change_log WHERE entity = 'message' AND entity_id = ?
+    ''', (str(message_id),))
+    record_change(cursor, [sender_user_id, recipient_user_id], 'message', message_id, 'delete')
+
+
+def record_read_cursor(cursor, user_id, other_user_id, conversation_key, last_read_message_id):
+    """Log a read cursor move for the reader and the other participant"""
+    record_change(cursor, [user_id, other_user_id], 'read_cursor', f'{conversation_key}/{user_id}', 'upsert', {
+        'conversation_key': conversation_key,
+        'reader_user_id': user_id,
+        'last_read_message_id': last_read_message_id
+    })
+
+
+def record_friend_request(cursor, request_id):
+    """Log the current state of a friend request for its sender and recipient"""
+    cursor.execute('''
+        SELECT request_id, sender_user_id, sender_username, recipient_user_id,
+               recipient_username, status, request_data, timestamp
+        FROM friend_requests WHERE request_id = ?
+    ''', (request_id,))
+    row = cursor.fetchone()
+    friend_request = dict(zip((
+        'request_id', 'sender_user_id', 'sender_username', 'recipient_user_id',
+        'recipient_username', 'status', 'request_data', 'timestamp'
+    ), row))
+    record_change(cursor, [row[1], row[3]], 'friend_request', request_id, 'upsert', friend_request)
+
+
+def record_friendship(cursor, row):
+    """Log a new friendship row (friend_graph FRIENDSHIP_COLUMNS order) for both users"""
+    friendship_id, user1_id, user1_username, user2_id, user2_username, friendship_date = row
+    for user_id, friend_id, friend_username in ((user1_id, user2_id, user2_username), (user2_id, user1_id, user1_username)):
+        record_change(cursor, [user_id], 'friend', friend_id, 'upsert', {
+            'friendship_id': friendship_id,
+            'friend_id': friend_id,
+            'friend_username': friend_username,
+            'friendship_date': friendship_date
+        })
+
+
+def record_friendship_removed(cursor, user1_id, user2_id):
+    """Log a tombstone for a removed friendship on both friend lists"""
+    record_change(cursor, [user1_id], 'friend', user2_id, 'delete')
+    record_change(cursor, [user2_id], 'friend', user1_id, 'delete')
+
+
+def latest_change_id(cursor, user_id):
+    """Newest change_id logged for a user, 0 if none"""
+    cursor.execute('SELECT MAX(change_id) FROM change_log WHERE user_id = ?', (user_id,))
+    return cursor.fetchone()[0] or 0
+
+
+def entity_version(user_id, entity):
+    """ETag version of one of a user's lists: the newest change_id logged for that entity
+
+    One seek on idx_change_log_user_entity_change, so it is far cheaper
+    than building the list.
+    """
+    with get_db_connection(CHAT_DATABASE) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT MAX(change_id) FROM change_log WHERE user_id = ? AND entity = ?
+        ''', (user_id, entity))
+        return f'{user_id}-{entity}-{cursor.fetchone()[0] or 0}'
+
+
+def fetch_changes(cursor, user_id, since, limit):
+    """Changes for a user after change_id `since`, oldest first
+
+    Returns (changes, has_more).
+    """
+    cursor.execute('''
+        SELECT change_id, entity, entity_id, operation, data, created_at
+        FROM change_log
+        WHERE user_id = ? AND change_id > ?
+        ORDER BY change_id
+        LIMIT ?
+    ''', (user_id, since, limit + 1))
+    rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    changes = []
+    for change_id, entity, entity_id, operation, data, created_at in rows[:limit]:
+        changes.append({
+            'change_id': change_id,
+            'entity': entity,
+            'id': entity_id,
+            'operation': operation,
+            'data': json.loads(data) if data is not None else None,
+            'changed_at': created_at
+        })
+
+    return changes, has_more
+
+
+def change_log_horizon(cursor):
+    """Highest change_id pruned so far; a client synced to an older cursor has to resync"""
+    cursor.execute('SELECT pruned_through FROM change_log_horizon WHERE id = 1')
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def prune_old_changes(database=CHAT_DATABASE, max_age_days=CHANGE_LOG_RETENTION_DAYS, batch_size=COMPACT_BATCH_SIZE):
+    """Delete changes older than max_age_days, advancing the horizon past them
+
+    Like the message archiver, only the oldest run of rows (by change_id) is
+    removed, so everything up to the horizon is gone and nothing after it is.
+    Returns the number of rows deleted.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+    pruned = 0
+
+    with get_db_connection(database) as conn:
+        while True:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            cursor.execute('SELECT change_id, created_at FROM change_log ORDER BY change_id LIMIT ?', (batch_size,))
+            rows = cursor.fetchall()
+
+            old = []
+            for change_id, created_at in rows:
+                if created_at >= cutoff:
+                    break
+                old.append(change_id)
+
+            if not old:
+                conn.rollback()
+                break
+
+            cursor.execute('DELETE FROM change_log WHERE change_id <= ?', (old[-1],))
+            cursor.execute('''
+                UPDATE change_log_horizon SET pruned_through = MAX(pruned_through, ?) WHERE id = 1
+            ''', (old[-1],))
+            conn.commit()
+            pruned += len(old)
+
+            if len(old) < batch_size:
+                break
+
+    return pruned
+
+
+def collapse_superseded_changes(database=CHAT_DATABASE, batch_size=COMPACT_BATCH_SIZE):
+    """Delete changes made obsolete by a later upsert or delete of the same entity for the same user
+
+    Any cursor still ends up at the same state, since the surviving row
+    carries the whole object (or the tombstone). Rows followed only by
+    'update' rows are kept, as an update alone is not the whole object.
+    Returns the number of rows deleted.
+    """
+    collapsed = 0
+    after = 0
+
+    with get_db_connection(database) as conn:
+        while True:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT MAX(change_id) FROM (
+                    SELECT change_id FROM change_log WHERE change_id > ? ORDER BY change_id LIMIT ?
+                )
+            ''', (after, batch_size))
+            upto = cursor.fetchone()[0]
+            if upto is None:
+                conn.rollback()
+                break
+
+            cursor.execute('''
+                DELETE FROM change_log WHERE change_id IN (
+                    SELECT older.change_id FROM change_log AS older
+                    WHERE older.change_id > ? AND older.change_id <= ?
+                      AND EXISTS (
+                          SELECT 1 FROM change_log AS newer
+                          WHERE newer.entity = older.entity AND newer.entity_id = older.entity_id
+                            AND newer.user_id = older.user_id AND newer.change_id > older.change_id
+                            AND newer.operation != 'update'
+                      )
+                )
+            ''', (after, upto))
+            collapsed += cursor.rowcount
+            conn.commit()
+            after = upto
+
+    return collapsed
+
+
+class ChangeLogCompactor:
+    """Background thread that periodically prunes and collapses the change log"""
+
+    def __init__(self, database=CHAT_DATABASE, interval=COMPACT_INTERVAL_SECONDS):
+        self.database = database
+        self.interval = interval
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the compactor thread if it is not running yet"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='change-log-compactor', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                prune_old_changes(self.database)
+                collapse_superseded_changes(self.database)
+            except Exception as e:
+                print(f"Error compacting change log: {e}")
+            time.sleep(self.interval)
+
+
+# Shared compactor for chat.db
+change_log_compactor = ChangeLogCompactor()
@@ -0,0 +1,128 @@
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Configuration
+EVENT_BUFFER_SIZE = 256  # Recent events kept per user so reconnecting streams can resume
+CHANNEL_IDLE_SECONDS = 60  # A channel without subscribers is dropped after this long
+SYNC_URL = '/auth/sync'  # Where clients recover events the buffer no longer holds
+RESYNC_EVENT = 'resync_required'
+
+
+class _UserChannel:
+    def __init__(self, dropped_through):
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=EVENT_BUFFER_SIZE)  # (sequence, event_type, data)
+        # Events up to this sequence may have existed but are not in the buffer
+        self.dropped_through = dropped_through
+        self.subscribers = 0
+        self.idle_since = time.monotonic()
+
+
+class EventBus:
+    """In-process publish/subscribe of per-user events for SSE and long-polling
+
+    Every event gets a sequence number from one process-wide counter, so a
+    subscriber asks for "events after N" and never misses one published
+    between its last read and its next wait. Each user has a Condition that
+    publishers notify, so idle subscribers just sleep on it.
+
+    Only users with a subscriber, or one that left less than
+    CHANNEL_IDLE_SECONDS ago, have a channel; events for anyone else are
+    not kept. A subscriber asking for events the channel no longer holds
+    gets a resync_required event pointing at /auth/sync instead.
+    """
+
+    def __init__(self):
+        self._channels = {}
+        self._channels_lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._sequence_lock = threading.Lock()
+        self._last_sequence = 0
+        self._last_sweep = time.monotonic()
+
+    def _sweep_idle_channels(self):
+        """Drop channels nobody has subscribed to for CHANNEL_IDLE_SECONDS; caller holds _channels_lock"""
+        now = time.monotonic()
+        if now - self._last_sweep < CHANNEL_IDLE_SECONDS:
+            return
+        self._last_sweep = now
+        for user_id, channel in list(self._channels.items()):
+            if channel.subscribers == 0 and now - channel.idle_since >= CHANNEL_IDLE_SECONDS:
+                del self._channels[user_id]
+
+    @contextmanager
+    def subscription(self, user_id):
+        """Keep user_id's channel, and the events published to it, alive for the duration"""
+        with self._channels_lock:
+            self._sweep_idle_channels()
+            channel = self._channels.get(user_id)
+            if channel is None:
+                # Nothing published before now was kept for this user
+                with self._sequence_lock:
+                    channel = self._channels[user_id] = _UserChannel(self._last_sequence)
+            channel.subscribers += 1
+
+        try:
+            yield channel
+        finally:
+            with self._channels_lock:
+                channel.subscribers -= 1
+                if channel.subscribers == 0:
+                    channel.idle_since = time.monotonic()
+
+    def current_sequence(self):
+        """Sequence number of the latest event published to anyone"""
+        return self._last_sequence
+
+    def publish(self, user_id, event_type, data):
+        """Deliver an event to every subscriber of user_id"""
+        with self._channels_lock:
+            self._sweep_idle_channels()
+            channel = self._channels.get(user_id)
+
+        if channel is None:
+            with self._sequence_lock:
+                sequence = next(self._sequence)
+                self._last_sequence = sequence
+            return sequence
+
+        with channel.condition:
+            with self._sequence_lock:
+                sequence = next(self._sequence)
+                self._last_sequence = sequence
+            if len(channel.events) == channel.events.maxlen:
+                channel.dropped_through = channel.events[0][0]
+            channel.events.append((sequence, event_type, data))
+            channel.condition.notify_all()
+        return sequence
+
+    def wait(self, user_id, after_sequence, timeout, event_types=None):
+        """Block until the user has events newer than after_sequence or timeout passes
+
+        Returns the list of (sequence, event_type, data), possibly empty.
+        event_types restricts which events wake the caller. If events after
+        after_sequence were dropped, the list starts with a resync_required
+        event whose sequence is the newest dropped one.
+        """
+        deadline = time.monotonic() + timeout
+
+        with self.subscription(user_id) as channel, channel.condition:
+            while True:
+                events = [
+                    event for event in channel.events
+                    if event[0] > after_sequence and (event_types is None or event[1] in event_types)
+                ]
+                if after_sequence < channel.dropped_through:
+                    events.insert(0, (channel.dropped_through, RESYNC_EVENT, {'sync_url': SYNC_URL}))
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                channel.condition.wait(remaining)
+
+
+# Shared bus for the chat service
+event_bus = EventBus()
@@ -0,0 +1,117 @@
+from modules.chat.parse_pagination_args import DEFAULT_PAGE_SIZE
+from modules.chat.make_conversation_key import make_conversation_key
+from modules.chat.read_cursors import load_read_cursors, is_message_read
+from modules.chat.message_archive import list_archives
+from modules.database.connection_pool import get_db_connection
+
+
+# Configuration
+MAX_MESSAGE_ID = 2 ** 63 - 1  # Largest SQLite rowid, used when no before_id is given
+MESSAGE_COLUMNS = 'id, sender_user_id, recipient_user_id, message, timestamp, is_read, conversation_key'
+
+
+def _fetch_partition(cursor, filters, comparison, order, bound, limit):
+    """Seek each (where, params) filter by message id in one database and merge the results"""
+    # One bounded index range scan per filter instead of an OR over the whole table
+    selects = []
+    params = []
+    for where, where_params in filters:
+        selects.append(f'''
+            SELECT * FROM (
+                SELECT {MESSAGE_COLUMNS} FROM messages
+                WHERE {where} AND id {comparison} ?
+                ORDER BY id {order} LIMIT ?
+            )
+        ''')
+        params.extend(where_params + (bound, limit))
+
+    cursor.execute(' UNION ALL '.join(selects) + f' ORDER BY id {order} LIMIT ?', params + [limit])
+    return cursor.fetchall()
+
+
+def _fetch_page(cursor, filters, before_id, after_id, limit):
+    """Get one page of messages matching any filter from chat.db and the archives
+
+    Returns (rows, has_more). Rows are newest first when paging backwards
+    (before_id or no cursor) and oldest first when paging forwards (after_id).
+    Archived ids are all lower than the ids in chat.db, so partitions are
+    read in id order and only opened when the hot table can't fill the page.
+    """
+    if after_id is not None:
+        comparison, order, bound = '>', 'ASC', after_id
+        archives = [archive for archive in list_archives(cursor) if archive[2] > after_id]
+    else:
+        comparison, order = '<', 'DESC'
+        bound = before_id if before_id is not None else MAX_MESSAGE_ID
+        archives = [archive for archive in reversed(list_archives(cursor)) if archive[1] < bound]
+
+    def hot_rows(needed):
+        return _fetch_partition(cursor, filters, comparison, order, bound, needed)
+
+    def archive_rows(path):
+        def fetch(needed):
+            with get_db_connection(path) as archive_conn:
+                return _fetch_partition(archive_conn.cursor(), filters, comparison, order, bound, needed)
+        return fetch
+
+    partitions = [archive_rows(archive[0]) for archive in archives]
+    if after_id is not None:
+        partitions.append(hot_rows)
+    else:
+        partitions.insert(0, hot_rows)
+
+    rows = []
+    seen_ids = set()
+    for fetch in partitions:
+        for row in fetch(limit + 1 - len(rows)):
+            # A crash mid-archive can briefly leave a message in both places
+            if row[0] not in seen_ids:
+                seen_ids.add(row[0])
+                rows.append(row)
+        if len(rows) > limit:
+            break
+
+    return rows[:limit], len(rows) > limit
+
+
+def fetch_user_messages(cursor, user_id, before_id=None, after_id=None, limit=DEFAULT_PAGE_SIZE):
+    """Get one page of messages the user sent or received"""
+    return _fetch_page(cursor, [
+        ('sender_user_id = ?', (user_id,)),
+        ('recipient_user_id = ?', (user_id,)),
+    ], before_id, after_id, limit)
+
+
+def fetch_conversation_messages(cursor, user_id, other_user_id, before_id=None, after_id=None, limit=DEFAULT_PAGE_SIZE):
+    """Get one page of messages exchanged between two users"""
+    conversation_key = make_conversation_key(user_id, other_user_id)
+    return _fetch_page(cursor, [
+        ('conversation_key = ?', (conversation_key,)),
+    ], before_id, after_id, limit)
+
+
+def next_page_cursor(rows, after_id, has_more):
+    """Id to pass back as before_id/after_id (whichever was used) to get the next page"""
+    if after_id is not None:
+        # Forward paging always returns a cursor so clients can poll for newer messages
+        return rows[-1][0] if rows else after_id
+    return rows[-1][0] if has_more else None
+
+
+def format_message(row, user_id, read_cursors):
+    """Convert a message row into the API representation"""
+    return {
+        'message_id': row[0],
+        'sender': row[1],
+        'recipient': row[2],
+        'message': row[3],
+        'timestamp': row[4],
+        'is_read': is_message_read(row[0], row[2], row[6], row[5], read_cursors),
+        'direction': 'sent' if row[1] == user_id else 'received'
+    }
+
+
+def format_messages(cursor, rows, user_id):
+    """Convert a page of message rows, deriving is_read from the read cursors"""
+    read_cursors = load_read_cursors(cursor, [row[6] for row in rows])
+    return [format_message(row, user_id, read_cursors) for row in rows]
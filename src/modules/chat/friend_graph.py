@@ -0,0 +1,191 @@
+import heapq
+import threading
+from collections import Counter, OrderedDict
+from modules.database.connection_pool import get_db_connection
+
+
+# Configuration
+FRIENDS_DATABASE = 'chat.db'
+FRIENDSHIP_COLUMNS = 'friendship_id, user1_id, user1_username, user2_id, user2_username, friendship_date'
+MAX_SUGGESTIONS = 50  # Ranked suggestions computed (and cached) per user
+SUGGESTION_CACHE_SIZE = 1024  # Users whose suggestions are kept at once
+
+
+def load_friendship_row(cursor, friendship_id):
+    """Read a friendship row (FRIENDSHIP_COLUMNS order) inside the caller's transaction"""
+    cursor.execute(f'SELECT {FRIENDSHIP_COLUMNS} FROM friends WHERE friendship_id = ?', (friendship_id,))
+    return cursor.fetchone()
+
+
+class FriendGraph:
+    """In-memory adjacency sets of the friends table
+
+    SQLite stays the source of truth: the graph is loaded from chat.db and
+    every writer applies its change while holding `lock` around its commit,
+    so the graph sees changes in commit order. `version` increases on every
+    change and each user records the version that last touched their friend
+    set, so derived results can be cached against it.
+    """
+
+    def __init__(self, database=FRIENDS_DATABASE):
+        self.database = database
+        self.lock = threading.RLock()
+        self.version = 0
+        self._friends = {}  # user_id -> {friend_id: friendship details}
+        self._usernames = {}  # user_id -> username, for users in any friendship
+        self._changed = {}  # user_id -> version of the last change to their friend set
+        self._suggestions = OrderedDict()  # user_id -> (version, ranked suggestions)
+        self._loaded = False
+
+    def load(self):
+        """(Re)build the graph from the friends table"""
+        with self.lock:
+            with get_db_connection(self.database) as conn:
+                rows = conn.execute(f'SELECT {FRIENDSHIP_COLUMNS} FROM friends').fetchall()
+
+            self._friends = {}
+            self._usernames = {}
+            self._changed = {}
+            self._suggestions.clear()
+            for row in rows:
+                self._add_row(row)
+            self._loaded = True
+            self.version += 1
+
+        print(f"Friend graph loaded with {len(rows)} friendships")
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self.lock:
+                if not self._loaded:
+                    self.load()
+
+    def _add_row(self, row):
+        friendship_id, user1_id, user1_username, user2_id, user2_username, friendship_date = row
+        self._usernames[user1_id] = user1_username
+        self._usernames[user2_id] = user2_username
+        self._friends.setdefault(user1_id, {})[user2_id] = {
+            'friendship_id': friendship_id,
+            'friend_id': user2_id,
+            'friend_username': user2_username,
+            'friendship_date': friendship_date
+        }
+        self._friends.setdefault(user2_id, {})[user1_id] = {
+            'friendship_id': friendship_id,
+            'friend_id': user1_id,
+            'friend_username': user1_username,
+            'friendship_date': friendship_date
+        }
+
+    def add(self, row):
+        """Record a committed friendship row"""
+        with self.lock:
+            if self._loaded:
+                self._add_row(row)
+                self.version += 1
+                self._changed[row[1]] = self._changed[row[3]] = self.version
+
+    def remove(self, user1_id, user2_id):
+        """Record a committed friendship removal"""
+        with self.lock:
+            if self._loaded:
+                self._friends.get(user1_id, {}).pop(user2_id, None)
+                self._friends.get(user2_id, {}).pop(user1_id, None)
+                self.version += 1
+                self._changed[user1_id] = self._changed[user2_id] = self.version
+
+    def are_friends(self, user1_id, user2_id):
+        """Check whether two users are friends"""
+        self._ensure_loaded()
+        return user2_id in self._friends.get(user1_id, ())
+
+    def friend_count(self, user_id):
+        """Number of friends a user has"""
+        self._ensure_loaded()
+        return len(self._friends.get(user_id, ()))
+
+    def friend_ids(self, user_id):
+        """Snapshot of a user's friend ids as a set"""
+        self._ensure_loaded()
+        with self.lock:
+            return set(self._friends.get(user_id, ()))
+
+    def get_friends(self, user_id):
+        """A user's friends, most recent friendship first (same shape as the friends API)"""
+        self._ensure_loaded()
+        with self.lock:
+            friends = [dict(details) for details in self._friends.get(user_id, {}).values()]
+        friends.sort(key=lambda friend: friend['friendship_date'] or '', reverse=True)
+        return friends
+
+    def mutual_friends(self, user1_id, user2_id):
+        """Friends two users have in common, ordered by username"""
+        self._ensure_loaded()
+        with self.lock:
+            friends1 = self._friends.get(user1_id, {})
+            friends2 = self._friends.get(user2_id, {})
+            # Walk the smaller adjacency set and probe the larger one
+            if len(friends1) > len(friends2):
+                friends1, friends2 = friends2, friends1
+            mutual = [
+                {'friend_id': friend_id, 'friend_username': self._usernames.get(friend_id)}
+                for friend_id in friends1 if friend_id in friends2
+            ]
+        mutual.sort(key=lambda friend: friend['friend_username'] or '')
+        return mutual
+
+    def suggest_friends(self, user_id, limit=MAX_SUGGESTIONS):
+        """Non-friends ranked by number of mutual friends (friends of friends)
+
+        Costs one pass over the friends' adjacency sets. The ranking is cached
+        per user and only recomputed after the user's or one of their friends'
+        friend sets changed. Only the cache check and copying the friends'
+        adjacency sets happen under `lock`; the scoring runs outside it so
+        friendship checks and friend lists are not held up meanwhile.
+        """
+        self._ensure_loaded()
+        with self.lock:
+            own_friends = list(self._friends.get(user_id, ()))
+
+            cached = self._suggestions.get(user_id)
+            if cached is not None:
+                last_change = max(
+                    [self._changed.get(user_id, 0)] + [self._changed.get(friend_id, 0) for friend_id in own_friends]
+                )
+                if last_change <= cached[0]:
+                    self._suggestions.move_to_end(user_id)
+                    return [dict(suggestion) for suggestion in cached[1][:limit]]
+
+            version = self.version
+            neighbours = [list(self._friends.get(friend_id, ())) for friend_id in own_friends]
+
+        mutual_counts = Counter()
+        for friend_ids in neighbours:
+            mutual_counts.update(friend_ids)
+
+        mutual_counts.pop(user_id, None)
+        for friend_id in own_friends:
+            mutual_counts.pop(friend_id, None)
+
+        ranked = heapq.nsmallest(
+            MAX_SUGGESTIONS, mutual_counts.items(), key=lambda item: (-item[1], item[0])
+        )
+
+        with self.lock:
+            suggestions = [
+                {'user_id': candidate_id, 'username': self._usernames.get(candidate_id), 'mutual_friends': count}
+                for candidate_id, count in ranked
+            ]
+
+            # Cached against the version copied above, so a change made while
+            # scoring just means the next call recomputes
+            self._suggestions[user_id] = (version, suggestions)
+            self._suggestions.move_to_end(user_id)
+            while len(self._suggestions) > SUGGESTION_CACHE_SIZE:
+                self._suggestions.popitem(last=False)
+
+        return [dict(suggestion) for suggestion in suggestions[:limit]]
+
+
+# Shared graph for the chat service
+friend_graph = FriendGraph()
@@ -6,13 +6,14 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.user_directory import user_directory
 
 
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
@@ -23,35 +24,8 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 def get_username_by_user_id(user_id):
     """Get username by user_id from users database"""
     try:
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
-
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                # Test if the table exists
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    break
-                user_conn.close()
-                user_conn = None
-            except:
-                if user_conn:
-                    user_conn.close()
-                continue
-
-        if not user_conn:
-            print("Could not find users database")
-            return None
-
-        cursor = user_conn.cursor()
-        cursor.execute("SELECT username FROM users WHERE user_id = ?", (user_id,))
-        result = cursor.fetchone()
-        user_conn.close()
-
-        return result[0] if result else None
+        user = user_directory.get_by_user_id(user_id)
+        return user['username'] if user else None
 
     except Exception as e:
         print(f"Error getting username by user_id: {e}")
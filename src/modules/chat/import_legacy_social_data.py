@@ -0,0 +1,65 @@
+import os
+import sqlite3
+from modules.database.connection_pool import get_db_connection
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+LEGACY_FRIENDS_DATABASE = 'friends.db'  # Standalone file used before friends moved into chat.db
+LEGACY_FR_REQUESTS_DATABASE = 'fr_requests.db'  # Standalone file used before friend requests moved into chat.db
+
+FRIENDS_COLUMNS = 'friendship_id, user1_id, user1_username, user2_id, user2_username, friendship_date'
+FRIEND_REQUESTS_COLUMNS = (
+    'request_id, sender_user_id, sender_username, recipient_user_id, '
+    'recipient_username, status, request_data, timestamp'
+)
+
+
+def _read_legacy_rows(database, table, columns):
+    """Read every row of a table from a legacy database file (empty if the file or table is missing)"""
+    if not os.path.exists(database):
+        return []
+
+    legacy_conn = sqlite3.connect(f'file:{database}?mode=ro', uri=True)
+    try:
+        cursor = legacy_conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if not cursor.fetchone():
+            return []
+        cursor.execute(f'SELECT {columns} FROM {table}')
+        return cursor.fetchall()
+    finally:
+        legacy_conn.close()
+
+
+def _copy_rows(cursor, database, table, columns):
+    rows = _read_legacy_rows(database, table, columns)
+    if rows:
+        placeholders = ', '.join('?' for _ in columns.split(','))
+        # Original ids are kept, so rows already copied are skipped on a re-run
+        cursor.executemany(f'INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})', rows)
+    print(f"Imported {len(rows)} {table} rows from {database}")
+
+
+def import_legacy_friends(cursor, database=LEGACY_FRIENDS_DATABASE):
+    """Copy friendships from the legacy friends.db into chat.db inside the caller's transaction"""
+    _copy_rows(cursor, database, 'friends', FRIENDS_COLUMNS)
+
+
+def import_legacy_friend_requests(cursor, database=LEGACY_FR_REQUESTS_DATABASE):
+    """Copy friend requests from the legacy fr_requests.db into chat.db inside the caller's transaction"""
+    _copy_rows(cursor, database, 'friend_requests', FRIEND_REQUESTS_COLUMNS)
+
+
+if __name__ == '__main__':
+    # Manual re-run, e.g. after restoring an old friends.db/fr_requests.db backup:
+    #   cd src && python -m modules.chat.import_legacy_social_data
+    from modules.chat.init_chat_db import init_chat_db
+
+    init_chat_db()
+    with get_db_connection(CHAT_DATABASE) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        cursor = conn.cursor()
+        import_legacy_friends(cursor)
+        import_legacy_friend_requests(cursor)
+        conn.commit()
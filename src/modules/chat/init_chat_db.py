@@ -5,6 +5,9 @@ import jwt
 from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
+from modules.database.migrations import run_migrations
+from modules.chat.import_legacy_social_data import import_legacy_friends, import_legacy_friend_requests
+from modules.chat.message_search import index_existing_messages
 
 app = Flask(__name__)
 
@@ -14,12 +17,10 @@ USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
 
-def init_chat_db():
-    """Initialize the chat database with messages table"""
-    conn = sqlite3.connect(CHAT_DATABASE)
-    cursor = conn.cursor()
-
-    cursor.execute('''
+# Ordered schema migrations for chat.db: (version, description, steps)
+CHAT_MIGRATIONS = [
+    (1, 'Create messages table', [
+        '''
         CREATE TABLE IF NOT EXISTS messages (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             sender_user_id TEXT NOT NULL,
@@ -28,7 +29,191 @@ def init_chat_db():
             timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             is_read BOOLEAN DEFAULT FALSE
         )
-    ''')
+        ''',
+    ]),
+    (2, 'Index messages by recipient and sender', [
+        'CREATE INDEX IF NOT EXISTS idx_messages_recipient_id ON messages (recipient_user_id, id)',
+        'CREATE INDEX IF NOT EXISTS idx_messages_sender_id ON messages (sender_user_id, id)',
+    ]),
+    (3, 'Add conversation_key to messages', [
+        'ALTER TABLE messages ADD COLUMN conversation_key TEXT',
+        # Same ordering as make_conversation_key(): lower user_id first
+        '''
+        UPDATE messages SET conversation_key = CASE
+            WHEN sender_user_id < recipient_user_id THEN sender_user_id || ':' || recipient_user_id
+            ELSE recipient_user_id || ':' || sender_user_id
+        END
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_messages_conversation_id ON messages (conversation_key, id)',
+    ]),
+    (4, 'Add materialized message counters', [
+        '''
+        CREATE TABLE IF NOT EXISTS chat_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_message_counters (
+            user_id TEXT PRIMARY KEY,
+            sent_count INTEGER NOT NULL DEFAULT 0,
+            received_count INTEGER NOT NULL DEFAULT 0,
+            unread_count INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS conversation_unread_counters (
+            user_id TEXT NOT NULL,
+            conversation_key TEXT NOT NULL,
+            other_user_id TEXT NOT NULL,
+            unread_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, conversation_key)
+        )
+        ''',
+        # Backfill from the existing messages (one-off full scans)
+        '''
+        INSERT INTO user_message_counters (user_id, sent_count, received_count, unread_count)
+        SELECT user_id, SUM(sent), SUM(received), SUM(unread) FROM (
+            SELECT sender_user_id AS user_id, 1 AS sent, 0 AS received, 0 AS unread FROM messages
+            UNION ALL
+            SELECT recipient_user_id, 0, 1, CASE WHEN is_read THEN 0 ELSE 1 END FROM messages
+        )
+        GROUP BY user_id
+        ''',
+        '''
+        INSERT INTO conversation_unread_counters (user_id, conversation_key, other_user_id, unread_count)
+        SELECT recipient_user_id, conversation_key, sender_user_id, COUNT(*)
+        FROM messages WHERE NOT is_read
+        GROUP BY recipient_user_id, conversation_key
+        ''',
+        '''
+        INSERT INTO chat_counters (name, value)
+        SELECT 'total_messages', COUNT(*) FROM messages
+        UNION ALL SELECT 'unread_messages', COUNT(*) FROM messages WHERE NOT is_read
+        UNION ALL SELECT 'active_senders', COUNT(*) FROM user_message_counters WHERE sent_count > 0
+        UNION ALL SELECT 'active_recipients', COUNT(*) FROM user_message_counters WHERE received_count > 0
+        ''',
+    ]),
+    (5, 'Add per-conversation read cursors', [
+        '''
+        CREATE TABLE IF NOT EXISTS read_cursors (
+            user_id TEXT NOT NULL,
+            conversation_key TEXT NOT NULL,
+            last_read_message_id INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, conversation_key)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_read_cursors_conversation ON read_cursors (conversation_key)',
+    ]),
+    # Friend requests and friendships used to live in fr_requests.db and friends.db;
+    # keeping them here lets accept/reject commit once in a single transaction
+    (6, 'Move friends and friend requests into chat.db', [
+        '''
+        CREATE TABLE IF NOT EXISTS friends (
+            friendship_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user1_id TEXT NOT NULL,
+            user1_username TEXT NOT NULL,
+            user2_id TEXT NOT NULL,
+            user2_username TEXT NOT NULL,
+            friendship_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user1_id) REFERENCES users(user_id),
+            FOREIGN KEY (user2_id) REFERENCES users(user_id),
+            UNIQUE(user1_id, user2_id),
+            UNIQUE(user2_id, user1_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS friend_requests (
+            request_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender_user_id TEXT NOT NULL,
+            sender_username TEXT NOT NULL,
+            recipient_user_id TEXT NOT NULL,
+            recipient_username TEXT NOT NULL,
+            status TEXT DEFAULT 'pending',
+            request_data TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (sender_user_id) REFERENCES users(user_id),
+            FOREIGN KEY (recipient_user_id) REFERENCES users(user_id),
+            UNIQUE(sender_user_id, recipient_user_id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_friend_requests_recipient_status ON friend_requests (recipient_user_id, status)',
+        'CREATE INDEX IF NOT EXISTS idx_friend_requests_sender_status ON friend_requests (sender_user_id, status)',
+        import_legacy_friends,
+        import_legacy_friend_requests,
+    ]),
+    (7, 'Add message archive catalog', [
+        '''
+        CREATE TABLE IF NOT EXISTS message_archives (
+            month TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            min_id INTEGER NOT NULL,
+            max_id INTEGER NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+    ]),
+    # rowid is the message id; participants is "sender recipient" so searches
+    # are scoped to the caller inside the index
+    (8, 'Add full-text message search index', [
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS message_search USING fts5(
+            message,
+            participants,
+            sender_user_id UNINDEXED,
+            recipient_user_id UNINDEXED,
+            conversation_key UNINDEXED,
+            timestamp UNINDEXED
+        )
+        ''',
+        index_existing_messages,
+    ]),
+    # Written in the same transaction as each mutation; read by /auth/sync
+    (9, 'Add per-user change log', [
+        '''
+        CREATE TABLE IF NOT EXISTS change_log (
+            change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            entity TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            data TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_change_log_user_change ON change_log (user_id, change_id)',
+    ]),
+    # Per-list ETags read the newest change of one entity for one user
+    (10, 'Index change log by entity', [
+        'CREATE INDEX IF NOT EXISTS idx_change_log_user_entity_change ON change_log (user_id, entity, change_id)',
+    ]),
+    # Optional per-sender idempotency key, so a retried send returns the first message
+    (11, 'Add client_message_id to messages', [
+        'ALTER TABLE messages ADD COLUMN client_message_id TEXT',
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_sender_client_message_id
+        ON messages (sender_user_id, client_message_id)
+        WHERE client_message_id IS NOT NULL
+        ''',
+    ]),
+    # Finds every logged change of one message, so deleting it can clear them
+    (12, 'Index change log by entity id', [
+        'CREATE INDEX IF NOT EXISTS idx_change_log_entity_id ON change_log (entity, entity_id)',
+    ]),
+    # Single row: every change_id up to pruned_through may have been compacted away
+    (13, 'Add change log horizon', [
+        '''
+        CREATE TABLE IF NOT EXISTS change_log_horizon (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            pruned_through INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        'INSERT OR IGNORE INTO change_log_horizon (id, pruned_through) VALUES (1, 0)',
+    ]),
+]
 
-    conn.commit()
-    conn.close()
+
+def init_chat_db():
+    """Initialize the chat database by applying pending migrations"""
+    run_migrations(CHAT_DATABASE, CHAT_MIGRATIONS)
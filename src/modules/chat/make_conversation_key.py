@@ -0,0 +1,4 @@
+def make_conversation_key(user1_id, user2_id):
+    """Build the key shared by both directions of a conversation (e.g. "U01:U02")"""
+    low, high = sorted((user1_id, user2_id))
+    return f'{low}:{high}'
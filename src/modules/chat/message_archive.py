@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from modules.database.connection_pool import get_db_connection
+from modules.database.migrations import run_migrations
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+ARCHIVE_DIRECTORY = os.environ.get('CHAT_ARCHIVE_DIRECTORY', 'archive')
+ARCHIVE_AFTER_DAYS = int(os.environ.get('CHAT_ARCHIVE_AFTER_DAYS', '90'))  # Messages older than this leave chat.db
+ARCHIVE_BATCH_SIZE = 1000  # Messages moved per write transaction
+ARCHIVE_INTERVAL_SECONDS = 3600  # How often the background archiver runs
+ARCHIVED_COLUMNS = 'id, sender_user_id, recipient_user_id, message, timestamp, is_read, conversation_key'
+
+# Schema of every monthly archive file (same columns and indexes as the hot messages table)
+ARCHIVE_MIGRATIONS = [
+    (1, 'Create archived messages table', [
+        '''
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY,
+            sender_user_id TEXT NOT NULL,
+            recipient_user_id TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp TIMESTAMP,
+            is_read BOOLEAN DEFAULT FALSE,
+            conversation_key TEXT
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_messages_recipient_id ON messages (recipient_user_id, id)',
+        'CREATE INDEX IF NOT EXISTS idx_messages_sender_id ON messages (sender_user_id, id)',
+        'CREATE INDEX IF NOT EXISTS idx_messages_conversation_id ON messages (conversation_key, id)',
+    ]),
+]
+
+_initialized_archives = set()
+_initialized_lock = threading.Lock()
+
+
+def _archive_path(month):
+    """Path of the archive file for a 'YYYY-MM' month"""
+    return os.path.join(ARCHIVE_DIRECTORY, f"messages_{month.replace('-', '_')}.db")
+
+
+def _ensure_archive(path):
+    with _initialized_lock:
+        if path in _initialized_archives:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        run_migrations(path, ARCHIVE_MIGRATIONS)
+        _initialized_archives.add(path)
+
+
+def list_archives(cursor):
+    """Get the archive catalog as (path, min_id, max_id) tuples, oldest first"""
+    cursor.execute('SELECT path, min_id, max_id FROM message_archives ORDER BY min_id')
+    return cursor.fetchall()
+
+
+def archive_old_messages(database=CHAT_DATABASE, max_age_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move messages older than max_age_days from chat.db into monthly archive files
+
+    Only the oldest run of messages (by id) is moved, so every archived id is
+    lower than every id still in chat.db and each archive covers one id range.
+    Returns the number of messages moved.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+    moved = 0
+
+    with get_db_connection(database) as conn:
+        while True:
+            # Hold the write lock while copying so no delete or mark-read is lost
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT {ARCHIVED_COLUMNS} FROM messages ORDER BY id LIMIT ?', (batch_size,))
+
+            rows = []
+            for row in cursor.fetchall():
+                if row[4] is None or row[4] >= cutoff:
+                    break
+                rows.append(row)
+
+            if not rows:
+                conn.rollback()
+                break
+
+            by_month = {}
+            for row in rows:
+                by_month.setdefault(row[4][:7], []).append(row)
+
+            for month, month_rows in by_month.items():
+                path = _archive_path(month)
+                _ensure_archive(path)
+
+                # The archive commits first; a crash before the hot delete only leaves duplicates
+                with get_db_connection(path) as archive_conn:
+                    archive_conn.executemany(
+                        f'INSERT OR IGNORE INTO messages ({ARCHIVED_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        month_rows
+                    )
+                    archive_conn.commit()
+
+                cursor.execute('''
+                    INSERT INTO message_archives (month, path, min_id, max_id, message_count)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (month) DO UPDATE SET
+                        min_id = MIN(min_id, excluded.min_id),
+                        max_id = MAX(max_id, excluded.max_id),
+                        message_count = message_count + excluded.message_count
+                ''', (month, path, month_rows[0][0], month_rows[-1][0], len(month_rows)))
+
+            cursor.executemany('DELETE FROM messages WHERE id = ?', [(row[0],) for row in rows])
+            conn.commit()
+            moved += len(rows)
+
+            if len(rows) < batch_size:
+                break
+
+    if moved:
+        print(f"Archived {moved} messages older than {max_age_days} days")
+
+    return moved
+
+
+def find_archived_message(cursor, message_id):
+    """Find an archived message by id, returning (archive_path, row) or None"""
+    cursor.execute('''
+        SELECT path FROM message_archives WHERE min_id <= ? AND max_id >= ?
+    ''', (message_id, message_id))
+
+    for (path,) in cursor.fetchall():
+        with get_db_connection(path) as archive_conn:
+            row = archive_conn.execute(
+                f'SELECT {ARCHIVED_COLUMNS} FROM messages WHERE id = ?', (message_id,)
+            ).fetchone()
+        if row:
+            return path, row
+
+    return None
+
+
+def delete_archived_message(cursor, path, message_id):
+    """Delete a message from its archive file and update the catalog count"""
+    with get_db_connection(path) as archive_conn:
+        archive_conn.execute('DELETE FROM messages WHERE id = ?', (message_id,))
+        archive_conn.commit()
+
+    cursor.execute('''
+        UPDATE message_archives SET message_count = message_count - 1 WHERE path = ?
+    ''', (path,))
+
+
+def mark_archived_message_read(path, message_id):
+    """Mark an archived message as read, returning 1 if it was unread and 0 otherwise"""
+    with get_db_connection(path) as archive_conn:
+        flipped = archive_conn.execute('''
+            UPDATE messages SET is_read = TRUE WHERE id = ? AND NOT is_read
+        ''', (message_id,)).rowcount
+        archive_conn.commit()
+
+    return flipped
+
+
+def count_archived_unread(cursor, conversation_key, user_id, after_id, up_to_id):
+    """Count unread messages received by user_id in archived partitions with after_id < id <= up_to_id"""
+    cursor.execute('''
+        SELECT path FROM message_archives WHERE max_id > ? AND min_id <= ?
+    ''', (after_id, up_to_id))
+
+    total = 0
+    for (path,) in cursor.fetchall():
+        with get_db_connection(path) as archive_conn:
+            total += archive_conn.execute('''
+                SELECT COUNT(*) FROM messages
+                WHERE conversation_key = ? AND id > ? AND id <= ?
+                  AND recipient_user_id = ? AND NOT is_read
+            ''', (conversation_key, after_id, up_to_id, user_id)).fetchone()[0]
+
+    return total
+
+
+class MessageArchiver:
+    """Background thread that periodically moves old messages into archive files"""
+
+    def __init__(self, database=CHAT_DATABASE, interval=ARCHIVE_INTERVAL_SECONDS):
+        self.database = database
+        self.interval = interval
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the archiver thread if it is not running yet"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='message-archiver', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                archive_old_messages(self.database)
+            except Exception as e:
+                print(f"Error archiving messages: {e}")
+            time.sleep(self.interval)
+
+
+# Shared archiver for chat.db
+message_archiver = MessageArchiver()
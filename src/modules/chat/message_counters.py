@@ -0,0 +1,99 @@
+# Materialized message counters kept in chat.db. Every function takes the
+# cursor of the caller's write transaction so counters commit (or roll back)
+# together with the message change that caused them.
+
+
+def _bump_counter(cursor, name, delta):
+    cursor.execute('INSERT OR IGNORE INTO chat_counters (name, value) VALUES (?, 0)', (name,))
+    cursor.execute('UPDATE chat_counters SET value = value + ? WHERE name = ?', (delta, name))
+
+
+def _bump_user_counter(cursor, user_id, column, delta):
+    """Adjust one per-user counter and return its new value"""
+    cursor.execute('INSERT OR IGNORE INTO user_message_counters (user_id) VALUES (?)', (user_id,))
+    cursor.execute(f'UPDATE user_message_counters SET {column} = {column} + ? WHERE user_id = ?', (delta, user_id))
+    cursor.execute(f'SELECT {column} FROM user_message_counters WHERE user_id = ?', (user_id,))
+    return cursor.fetchone()[0]
+
+
+def _bump_conversation_unread(cursor, user_id, conversation_key, other_user_id, delta):
+    cursor.execute('''
+        INSERT OR IGNORE INTO conversation_unread_counters (user_id, conversation_key, other_user_id)
+        VALUES (?, ?, ?)
+    ''', (user_id, conversation_key, other_user_id))
+    cursor.execute('''
+        UPDATE conversation_unread_counters SET unread_count = unread_count + ?
+        WHERE user_id = ? AND conversation_key = ?
+    ''', (delta, user_id, conversation_key))
+
+
+def record_message_sent(cursor, sender_user_id, recipient_user_id, conversation_key):
+    """Update counters for a newly inserted (unread) message"""
+    _bump_counter(cursor, 'total_messages', 1)
+    _bump_counter(cursor, 'unread_messages', 1)
+
+    if _bump_user_counter(cursor, sender_user_id, 'sent_count', 1) == 1:
+        _bump_counter(cursor, 'active_senders', 1)
+    if _bump_user_counter(cursor, recipient_user_id, 'received_count', 1) == 1:
+        _bump_counter(cursor, 'active_recipients', 1)
+
+    _bump_user_counter(cursor, recipient_user_id, 'unread_count', 1)
+    _bump_conversation_unread(cursor, recipient_user_id, conversation_key, sender_user_id, 1)
+
+
+def record_message_deleted(cursor, sender_user_id, recipient_user_id, conversation_key, was_unread):
+    """Update counters for a deleted message"""
+    _bump_counter(cursor, 'total_messages', -1)
+
+    if _bump_user_counter(cursor, sender_user_id, 'sent_count', -1) == 0:
+        _bump_counter(cursor, 'active_senders', -1)
+    if _bump_user_counter(cursor, recipient_user_id, 'received_count', -1) == 0:
+        _bump_counter(cursor, 'active_recipients', -1)
+
+    if was_unread:
+        record_messages_read(cursor, recipient_user_id, conversation_key, sender_user_id, 1)
+
+
+def record_messages_read(cursor, user_id, conversation_key, other_user_id, count):
+    """Update counters after a user read `count` messages in one conversation"""
+    if count <= 0:
+        return
+    _bump_counter(cursor, 'unread_messages', -count)
+    _bump_user_counter(cursor, user_id, 'unread_count', -count)
+    _bump_conversation_unread(cursor, user_id, conversation_key, other_user_id, -count)
+
+
+def get_chat_counters(cursor):
+    """Get the global counters as a dict"""
+    cursor.execute('SELECT name, value FROM chat_counters')
+    counters = {
+        'total_messages': 0,
+        'unread_messages': 0,
+        'active_senders': 0,
+        'active_recipients': 0
+    }
+    counters.update(dict(cursor.fetchall()))
+    return counters
+
+
+def get_unread_counts(cursor, user_id):
+    """Get a user's total unread count and the per-conversation breakdown"""
+    cursor.execute('SELECT unread_count FROM user_message_counters WHERE user_id = ?', (user_id,))
+    result = cursor.fetchone()
+    total_unread = result[0] if result else 0
+
+    cursor.execute('''
+        SELECT conversation_key, other_user_id, unread_count
+        FROM conversation_unread_counters
+        WHERE user_id = ? AND unread_count > 0
+    ''', (user_id,))
+
+    conversations = []
+    for row in cursor.fetchall():
+        conversations.append({
+            'conversation_key': row[0],
+            'other_user_id': row[1],
+            'unread_count': row[2]
+        })
+
+    return total_unread, conversations
@@ -0,0 +1,85 @@
+from modules.chat.message_archive import list_archives, ARCHIVED_COLUMNS
+from modules.database.connection_pool import get_db_connection
+
+
+# The FTS5 table message_search lives in chat.db and is keyed by message id
+# (rowid), including archived messages. The participants column holds both
+# user ids so scoping a search to the caller is part of the index lookup.
+
+
+def index_message(cursor, message_id, sender_user_id, recipient_user_id, message, conversation_key, timestamp=None):
+    """Add a message to the full-text index inside the caller's transaction"""
+    cursor.execute('''
+        INSERT INTO message_search (rowid, message, participants, sender_user_id, recipient_user_id, conversation_key, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    ''', (message_id, message, f'{sender_user_id} {recipient_user_id}', sender_user_id, recipient_user_id, conversation_key, timestamp))
+
+
+def unindex_message(cursor, message_id):
+    """Remove a message from the full-text index inside the caller's transaction"""
+    cursor.execute('DELETE FROM message_search WHERE rowid = ?', (message_id,))
+
+
+def index_existing_messages(cursor):
+    """Backfill the index from chat.db and every archive file (migration step)"""
+    cursor.execute('''
+        INSERT INTO message_search (rowid, message, participants, sender_user_id, recipient_user_id, conversation_key, timestamp)
+        SELECT id, message, sender_user_id || ' ' || recipient_user_id, sender_user_id, recipient_user_id, conversation_key, timestamp
+        FROM messages
+    ''')
+
+    for path, _, _ in list_archives(cursor):
+        with get_db_connection(path) as archive_conn:
+            rows = archive_conn.execute(f'SELECT {ARCHIVED_COLUMNS} FROM messages').fetchall()
+        for row in rows:
+            index_message(cursor, row[0], row[1], row[2], row[3], row[6], row[4])
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_match_query(user_id, query):
+    """Turn free text into an FTS5 query scoped to the user's conversations
+
+    Every word must match; a trailing * keeps prefix matching. Words are
+    quoted so FTS5 operators typed by users are searched as plain text.
+    """
+    terms = []
+    for word in query.split():
+        if word.endswith('*') and len(word) > 1:
+            terms.append(_quote(word.rstrip('*')) + '*')
+        elif word != '*':
+            terms.append(_quote(word))
+
+    if not terms:
+        raise ValueError('Search query must contain at least one word')
+
+    return f"participants : {_quote(user_id)} AND message : ({' '.join(terms)})"
+
+
+def search_messages(cursor, user_id, query, limit, offset=0, conversation_key=None):
+    """Get one page of the user's messages matching query, best match first
+
+    Returns (rows, has_more); rows are (id, sender, recipient, message,
+    timestamp, conversation_key, snippet).
+    """
+    sql = '''
+        SELECT rowid, sender_user_id, recipient_user_id, message, timestamp, conversation_key,
+               snippet(message_search, 0, '[', ']', '...', 12)
+        FROM message_search
+        WHERE message_search MATCH ?
+    '''
+    params = [build_match_query(user_id, query)]
+
+    if conversation_key is not None:
+        sql += ' AND conversation_key = ?'
+        params.append(conversation_key)
+
+    sql += ' ORDER BY rank LIMIT ? OFFSET ?'
+    params.extend([limit + 1, offset])
+
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,141 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from modules.database.connection_pool import get_db_connection
+from modules.chat.message_counters import record_message_sent
+from modules.chat.message_search import index_message
+from modules.chat.change_log import record_message_created
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+MAX_BATCH_SIZE = 64  # Messages committed together at most
+MAX_BATCH_DELAY = 0.002  # Seconds to wait for more messages before committing
+SUBMIT_TIMEOUT = 10  # Seconds a request waits for its message to be committed
+
+
+class MessageOutcomeUnknown(Exception):
+    """send() gave up waiting, but the message is still queued and may yet be committed"""
+
+
+class ClientMessageIdReused(Exception):
+    """The sender already stored a different message under this client_message_id"""
+
+
+class MessageWriter:
+    """Single writer thread that inserts queued messages and commits them in batches"""
+
+    def __init__(self, database=CHAT_DATABASE, max_batch_size=MAX_BATCH_SIZE, max_batch_delay=MAX_BATCH_DELAY):
+        self.database = database
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the writer thread if it is not running yet"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='message-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, sender_user_id, recipient_user_id, message, conversation_key, client_message_id=None):
+        """Queue a message and return a Future that resolves to (message_id, timestamp, created)
+
+        With a client_message_id a message the sender already stored under
+        that key is returned instead of inserting a second one; created is
+        then False. If the stored message has a different recipient or text
+        the Future raises ClientMessageIdReused instead.
+        """
+        self.start()
+        future = Future()
+        self._queue.put(((sender_user_id, recipient_user_id, message, conversation_key, client_message_id), future))
+        return future
+
+    def send(self, sender_user_id, recipient_user_id, message, conversation_key, client_message_id=None, timeout=SUBMIT_TIMEOUT):
+        """Queue a message and block until it is committed, returning (message_id, timestamp, created)
+
+        Raises MessageOutcomeUnknown after timeout seconds; the message stays
+        queued, so the caller must not report it as failed.
+        """
+        future = self.submit(sender_user_id, recipient_user_id, message, conversation_key, client_message_id)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise MessageOutcomeUnknown('Message is still queued; it may or may not be stored')
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+
+            # Collect whatever else arrives within the batch window
+            deadline = time.monotonic() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        try:
+            with get_db_connection(self.database) as conn:
+                cursor = conn.cursor()
+                results = []
+                for (sender_user_id, recipient_user_id, message, conversation_key, client_message_id), _ in batch:
+                    if client_message_id is not None:
+                        # A retry of a send that already went through gets the stored message back
+                        cursor.execute('''
+                            SELECT id, timestamp, recipient_user_id, message FROM messages
+                            WHERE sender_user_id = ? AND client_message_id = ?
+                        ''', (sender_user_id, client_message_id))
+                        row = cursor.fetchone()
+                        if row:
+                            if (row[2], row[3]) != (recipient_user_id, message):
+                                results.append(ClientMessageIdReused(
+                                    f'client_message_id {client_message_id!r} was already used for a different message'
+                                ))
+                            else:
+                                results.append((row[0], row[1], False))
+                            continue
+
+                    cursor.execute('''
+                        INSERT INTO messages (sender_user_id, recipient_user_id, message, conversation_key, client_message_id)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (sender_user_id, recipient_user_id, message, conversation_key, client_message_id))
+                    message_id = cursor.lastrowid
+                    cursor.execute('SELECT timestamp FROM messages WHERE id = ?', (message_id,))
+                    results.append((message_id, cursor.fetchone()[0], True))
+                    record_message_sent(cursor, sender_user_id, recipient_user_id, conversation_key)
+                    index_message(cursor, message_id, sender_user_id, recipient_user_id, message, conversation_key)
+                    record_message_created(cursor, message_id)
+
+                # One commit (and one fsync) for the whole batch
+                conn.commit()
+
+        except Exception as e:
+            if len(batch) > 1:
+                # Retry one by one so a single bad message doesn't fail the whole batch
+                for entry in batch:
+                    self._write_batch([entry])
+                return
+            print(f"Error writing message: {e}")
+            batch[0][1].set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Shared writer for chat.db
+message_writer = MessageWriter()
@@ -0,0 +1,38 @@
+from flask import request
+
+
+# Configuration
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _parse_positive_int(args, name):
+    value = args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+    if number < 0:
+        raise ValueError(f'{name} must not be negative')
+    return number
+
+
+def parse_pagination_args(args=None):
+    """Read before_id, after_id and limit from the query string, raising ValueError on bad input"""
+    if args is None:
+        args = request.args
+
+    before_id = _parse_positive_int(args, 'before_id')
+    after_id = _parse_positive_int(args, 'after_id')
+    if before_id is not None and after_id is not None:
+        raise ValueError('Use either before_id or after_id, not both')
+
+    limit = _parse_positive_int(args, 'limit')
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    return before_id, after_id, limit
@@ -0,0 +1,66 @@
+from modules.chat.message_counters import record_messages_read
+from modules.chat.message_archive import count_archived_unread
+
+
+def get_read_cursor(cursor, user_id, conversation_key):
+    """Get the id of the last message the user has read in a conversation (0 if none)"""
+    cursor.execute('''
+        SELECT last_read_message_id FROM read_cursors
+        WHERE user_id = ? AND conversation_key = ?
+    ''', (user_id, conversation_key))
+    result = cursor.fetchone()
+    return result[0] if result else 0
+
+
+def load_read_cursors(cursor, conversation_keys):
+    """Load every participant's read cursor for the given conversations
+
+    Returns a dict keyed by (user_id, conversation_key).
+    """
+    conversation_keys = list(set(conversation_keys))
+    if not conversation_keys:
+        return {}
+
+    placeholders = ', '.join('?' for _ in conversation_keys)
+    cursor.execute(f'''
+        SELECT user_id, conversation_key, last_read_message_id FROM read_cursors
+        WHERE conversation_key IN ({placeholders})
+    ''', conversation_keys)
+    return {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+
+
+def is_message_read(message_id, recipient_user_id, conversation_key, is_read_flag, read_cursors):
+    """A message is read if it was marked individually or the recipient's cursor has passed it"""
+    return bool(is_read_flag) or message_id <= read_cursors.get((recipient_user_id, conversation_key), 0)
+
+
+def advance_read_cursor(cursor, user_id, conversation_key, other_user_id, message_id):
+    """Move the user's read cursor forward to message_id and update the unread counters
+
+    Must run inside the caller's write transaction. Returns (last_read_message_id,
+    newly_read_count); a cursor never moves backwards.
+    """
+    current_cursor = get_read_cursor(cursor, user_id, conversation_key)
+    if message_id <= current_cursor:
+        return current_cursor, 0
+
+    # Received messages between the old and new cursor that were still unread
+    cursor.execute('''
+        SELECT COUNT(*) FROM messages
+        WHERE conversation_key = ? AND id > ? AND id <= ?
+          AND recipient_user_id = ? AND NOT is_read
+    ''', (conversation_key, current_cursor, message_id, user_id))
+    newly_read = cursor.fetchone()[0]
+    newly_read += count_archived_unread(cursor, conversation_key, user_id, current_cursor, message_id)
+
+    cursor.execute('''
+        INSERT INTO read_cursors (user_id, conversation_key, last_read_message_id)
+        VALUES (?, ?, ?)
+        ON CONFLICT (user_id, conversation_key) DO UPDATE SET
+            last_read_message_id = excluded.last_read_message_id,
+            updated_at = CURRENT_TIMESTAMP
+    ''', (user_id, conversation_key, message_id))
+
+    record_messages_read(cursor, user_id, conversation_key, other_user_id, newly_read)
+
+    return message_id, newly_read
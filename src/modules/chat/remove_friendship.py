@@ -6,36 +6,56 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
+from modules.database.connection_pool import get_db_connection
+from modules.chat.friend_graph import friend_graph
+from modules.chat.change_log import record_friendship_removed
 
 
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
-FR_REQUESTS_DATABASE = 'fr_requests.db'
-FRIENDS_DATABASE = 'friends.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
 USER_API_URL = 'http://localhost:5000'  # User registration API URL
 AUTH_API_URL = 'http://localhost:3000'  # Authentication API URL
 JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match auth_app.py
 
 
 
-def remove_friendship(user1_id, user2_id):
-    """Remove friendship from friends database"""
-    try:
-        conn = sqlite3.connect(FRIENDS_DATABASE)
-        cursor = conn.cursor()
+def _delete_friendship(cursor, user1_id, user2_id):
+    # Remove friendship (check both directions)
+    cursor.execute('''
+        DELETE FROM friends
+        WHERE (user1_id = ? AND user2_id = ?) OR (user1_id = ? AND user2_id = ?)
+    ''', (user1_id, user2_id, user2_id, user1_id))
+
+    removed = cursor.rowcount > 0
+    if removed:
+        record_friendship_removed(cursor, user1_id, user2_id)
+    return removed
+
 
-        # Remove friendship (check both directions)
-        cursor.execute('''
-            DELETE FROM friends
-            WHERE (user1_id = ? AND user2_id = ?) OR (user1_id = ? AND user2_id = ?)
-        ''', (user1_id, user2_id, user2_id, user1_id))
+def remove_friendship(user1_id, user2_id, cursor=None):
+    """Remove friendship from friends database
+
+    When a cursor is given the delete joins the caller's transaction; the
+    caller commits and then removes the pair from friend_graph. Errors are
+    raised instead of returned.
+    """
+    if cursor is not None:
+        return _delete_friendship(cursor, user1_id, user2_id)
+
+    try:
+        with get_db_connection(FRIENDS_DATABASE) as conn:
+            removed = _delete_friendship(conn.cursor(), user1_id, user2_id)
 
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+            # Commit and update the graph together so the graph follows commit order
+            with friend_graph.lock:
+                conn.commit()
+                if removed:
+                    friend_graph.remove(user1_id, user2_id)
 
-        return deleted_count > 0
+        return removed
 
     except Exception as e:
         print(f"Error removing friendship: {e}")
@@ -6,6 +6,7 @@ from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
 from modules.chat.token_verification_and_autorization import token_required
+from modules.chat.user_directory import user_directory
 
 # Configuration
 CHAT_DATABASE = 'chat.db'
@@ -17,44 +18,14 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 def search_user_by_username(username):
     """Search for a user by username in the users database"""
     try:
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
+        user = user_directory.get_by_username(username)
 
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                # Test if the table exists
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    print(f"Found users database at: {path}")
-                    break
-                user_conn.close()
-                user_conn = None
-            except:
-                if user_conn:
-                    user_conn.close()
-                continue
+        print(f"Database query result for username {username}: {'Found' if user else 'Not found'}")
 
-        if not user_conn:
-            print("Could not find users database")
-            return None
-
-        cursor = user_conn.cursor()
-        # Search for user by username (assuming there's a username column)
-        # If your users table uses 'user_id' as username, modify the query accordingly
-        cursor.execute("SELECT user_id, username FROM users WHERE username = ?", (username,))
-        result = cursor.fetchone()
-
-        print(f"Database query result for username {username}: {'Found' if result else 'Not found'}")
-
-        user_conn.close()
-
-        if result:
+        if user:
             return {
-                'user_id': result[0],
-                'username': result[1]
+                'user_id': user['user_id'],
+                'username': user['username']
             }
         return None
 
@@ -5,6 +5,7 @@ import jwt
 from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
+from modules.auth_app.verified_token_cache import VerifiedTokenCache
 
 app = Flask(__name__)
 
@@ -16,6 +17,9 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 
 
 
+verified_tokens = VerifiedTokenCache()
+
+
 def token_required(f):
     """Decorator to verify JWT token"""
     @wraps(f)
@@ -30,7 +34,11 @@ def token_required(f):
             if token.startswith('Bearer '):
                 token = token[7:]
 
-            data = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+            # Skip the base64/JSON/HMAC work for tokens this process already verified
+            data = verified_tokens.get(token)
+            if data is None:
+                data = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+                verified_tokens.put(token, data)
             current_user = {
                 'user_id': data['user_id'],
                 'username': data['username']
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from modules.database.users_database import get_users_db_connection
+
+
+# Configuration
+USER_DIRECTORY_MAX_ENTRIES = 10000  # Cached lookups (by user_id and by username) kept at most
+USER_DIRECTORY_TTL_SECONDS = 300  # Found users are re-read after this long
+USER_DIRECTORY_NEGATIVE_TTL_SECONDS = 5  # "Not found" answers expire fast so new registrations show up
+
+
+class UserDirectoryCache:
+    """Bounded LRU/TTL cache of user_id <-> username lookups against users.db
+
+    Both directions share one cache: loading a user by either key stores it
+    under both. Misses are cached briefly as None so repeated lookups of an
+    unknown user don't all reach SQLite.
+    """
+
+    def __init__(self, max_entries=USER_DIRECTORY_MAX_ENTRIES, ttl=USER_DIRECTORY_TTL_SECONDS,
+                 negative_ttl=USER_DIRECTORY_NEGATIVE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # (kind, value) -> (expires_at, user or None)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, entry[1]
+            self._misses += 1
+            return False, None
+
+    def _put(self, key, user):
+        expires_at = time.monotonic() + (self.ttl if user else self.negative_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _lookup(self, key, column, value):
+        found, user = self._get(key)
+        if found:
+            return user
+
+        with get_users_db_connection() as user_conn:
+            result = user_conn.execute(
+                f"SELECT user_id, username FROM users WHERE {column} = ?", (value,)
+            ).fetchone()
+
+        if result:
+            user = {'user_id': result[0], 'username': result[1]}
+            self._put(('user_id', user['user_id']), user)
+            self._put(('username', user['username']), user)
+        else:
+            self._put(key, None)
+
+        return user
+
+    def get_by_user_id(self, user_id):
+        """Get {'user_id', 'username'} for a user_id, or None if there is no such user"""
+        return self._lookup(('user_id', user_id), 'user_id', user_id)
+
+    def get_by_username(self, username):
+        """Get {'user_id', 'username'} for a username, or None if there is no such user"""
+        return self._lookup(('username', username), 'username', username)
+
+    def invalidate(self, user_id=None, username=None):
+        """Drop the cached lookups for one user, or every lookup when none is given"""
+        with self._lock:
+            if user_id is None and username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(('user_id', user_id), None)
+                self._entries.pop(('username', username), None)
+            self._invalidations += 1
+
+    def stats(self):
+        """Get hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+
+# Shared cache for the user lookup helpers
+user_directory = UserDirectoryCache()
+
+
+def invalidate_user_directory(user_id=None, username=None):
+    """Forget cached "not found" answers so a newly registered user is found immediately"""
+    user_directory.invalidate(user_id, username)
@@ -0,0 +1,104 @@
+import bisect
+import threading
+import time
+from modules.database.users_database import get_users_db_connection
+
+
+# Configuration
+REFRESH_INTERVAL_SECONDS = 1.0  # How stale the index may get before new registrations are loaded
+DEFAULT_PREFIX_LIMIT = 10
+MAX_PREFIX_LIMIT = 50
+
+
+class UsernameIndex:
+    """Sorted in-memory index of usernames for prefix (typeahead) lookups
+
+    Keys are case-folded usernames kept sorted, so a prefix is a bisect to
+    the first match followed by a short scan. Registration runs in its own
+    process, so a background thread picks up new users with an incremental
+    load of rows with a higher users.id every REFRESH_INTERVAL_SECONDS.
+    Lookups only read memory and never wait on SQLite.
+    """
+
+    def __init__(self, refresh_interval=REFRESH_INTERVAL_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._keys = []
+        self._entries = []
+        self._last_row_id = 0
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _insert(self, user_id, username):
+        key = (username.casefold(), username, user_id)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return
+        self._keys.insert(position, key)
+        self._entries.insert(position, {'user_id': user_id, 'username': username})
+
+    def refresh(self):
+        """Load users registered since the last refresh (single-flight: a concurrent call returns 0)"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0
+
+        try:
+            with get_users_db_connection() as user_conn:
+                rows = user_conn.execute('''
+                    SELECT id, user_id, username FROM users WHERE id > ? ORDER BY id
+                ''', (self._last_row_id,)).fetchall()
+
+            with self._lock:
+                for row_id, user_id, username in rows:
+                    self._insert(user_id, username)
+                    self._last_row_id = max(self._last_row_id, row_id)
+                self._last_refresh = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+        return len(rows)
+
+    def start(self):
+        """Start the refresher thread if it is not running yet"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='username-index-refresher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing username index: {e}")
+            time.sleep(self.refresh_interval)
+
+    def load(self):
+        """Build the index from users.db and start the refresher (called at startup)"""
+        loaded = self.refresh()
+        print(f"Username index loaded with {loaded} users")
+        self.start()
+
+    def search_prefix(self, prefix, limit=DEFAULT_PREFIX_LIMIT):
+        """Get up to limit users whose username starts with prefix (case-insensitive)"""
+        if self._thread is None:
+            # Started without load(): begin refreshing in the background, don't wait for it
+            self.start()
+
+        folded = prefix.casefold()
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (folded,))
+            matches = []
+            while position < len(self._keys) and len(matches) < limit:
+                if not self._keys[position][0].startswith(folded):
+                    break
+                matches.append(self._entries[position])
+                position += 1
+
+        return matches
+
+
+# Shared index for the chat service
+username_index = UsernameIndex()
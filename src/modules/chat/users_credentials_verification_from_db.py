@@ -5,6 +5,7 @@ import jwt
 from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
+from modules.database.users_database import get_users_db_connection
 
 
 app = Flask(__name__)
@@ -19,38 +20,13 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 def verify_user_credentials(user_id, password):
     """Verify user credentials against the user registration database (Legacy)"""
     try:
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
-
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                # Test if the table exists
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    print(f"Found users database at: {path}")
-                    break
-                user_conn.close()
-                user_conn = None
-            except:
-                if user_conn:
-                    user_conn.close()
-                continue
-
-        if not user_conn:
-            print("Could not find users database")
-            return False
-
-        cursor = user_conn.cursor()
-        cursor.execute("SELECT password_hash FROM users WHERE user_id = ?", (user_id,))
-        result = cursor.fetchone()
+        with get_users_db_connection() as user_conn:
+            cursor = user_conn.cursor()
+            cursor.execute("SELECT password_hash FROM users WHERE user_id = ?", (user_id,))
+            result = cursor.fetchone()
 
         print(f"Database query result for user {user_id}: {'Found' if result else 'Not found'}")
 
-        user_conn.close()
-
         if result:
             password_match = check_password_hash(result[0], password)
             print(f"Password verification for {user_id}: {'Success' if password_match else 'Failed'}")
@@ -5,6 +5,8 @@ import jwt
 from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import datetime, timedelta
+from modules.database.users_database import get_users_db_connection
+from modules.auth_app.password_hashing_pool import password_hashing_pool, PasswordHashingBusy
 
 
 # Configuration
@@ -16,42 +18,17 @@ JWT_SECRET_KEY = 'your-secret-key-change-this-in-production'  # Should match aut
 def verify_user_credentials_by_username(username, password):
     """Verify user credentials by username and return user_id if successful"""
     try:
-        # Try different possible paths for the users database
-        possible_paths = ['users.db', '../users.db', './users.db']
-        user_conn = None
-
-        for path in possible_paths:
-            try:
-                user_conn = sqlite3.connect(path)
-                cursor = user_conn.cursor()
-                # Test if the table exists
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if cursor.fetchone():
-                    print(f"Found users database at: {path}")
-                    break
-                user_conn.close()
-                user_conn = None
-            except:
-                if user_conn:
-                    user_conn.close()
-                continue
-
-        if not user_conn:
-            print("Could not find users database")
-            return None, False
-
-        cursor = user_conn.cursor()
-        # Query by username to get both user_id and password_hash
-        cursor.execute("SELECT user_id, password_hash FROM users WHERE username = ?", (username,))
-        result = cursor.fetchone()
+        with get_users_db_connection() as user_conn:
+            cursor = user_conn.cursor()
+            # Query by username to get both user_id and password_hash
+            cursor.execute("SELECT user_id, password_hash FROM users WHERE username = ?", (username,))
+            result = cursor.fetchone()
 
         print(f"Database query result for username {username}: {'Found' if result else 'Not found'}")
 
-        user_conn.close()
-
         if result:
             user_id, stored_password_hash = result
-            password_match = check_password_hash(stored_password_hash, password)
+            password_match = password_hashing_pool.check_password(stored_password_hash, password)
             print(f"Password verification for {username}: {'Success' if password_match else 'Failed'}")
 
             if password_match:
@@ -60,6 +37,10 @@ def verify_user_credentials_by_username(username, password):
                 return None, False
         return None, False
 
+    except PasswordHashingBusy:
+        # Let the caller answer 503 instead of reporting bad credentials
+        raise
+
     except Exception as e:
         print(f"Error verifying credentials: {e}")
         return None, False
@@ -0,0 +1,86 @@
+import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+
+
+# Configuration
+CHAT_DATABASE = 'chat.db'
+USERS_DATABASE = 'users.db'
+FR_REQUESTS_DATABASE = 'chat.db'
+FRIENDS_DATABASE = 'chat.db'
+POOL_SIZE = 8  # Idle connections kept per database file
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16384
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Applied once when a connection is opened, not on every request
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}',
+    f'PRAGMA cache_size = -{CACHE_SIZE_KB}',
+    f'PRAGMA mmap_size = {MMAP_SIZE}',
+)
+
+
+class ConnectionPool:
+    """Pool of long-lived connections to a single SQLite database file"""
+
+    def __init__(self, database, size=POOL_SIZE):
+        self.database = database
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection and hand it back to the pool afterwards"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            yield conn
+        finally:
+            # Never return a connection with an open transaction (e.g. after an exception)
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close_all(self):
+        """Close every idle connection in the pool"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database):
+    """Get (or create) the connection pool for a database file"""
+    pool = _pools.get(database)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(database)
+            if pool is None:
+                pool = ConnectionPool(database)
+                _pools[database] = pool
+    return pool
+
+
+def get_db_connection(database):
+    """Borrow a pooled connection, use as: with get_db_connection(CHAT_DATABASE) as conn"""
+    return get_pool(database).connection()
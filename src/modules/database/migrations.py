@@ -0,0 +1,46 @@
+from modules.database.connection_pool import get_db_connection
+
+
+def run_migrations(database, migrations):
+    """Apply pending (version, description, steps) migrations to a database in order
+
+    Each step is either an SQL string or a callable taking a cursor. Applied
+    versions are recorded in schema_version so every migration runs once.
+    """
+    applied = []
+
+    with get_db_connection(database) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+
+        for version, description, steps in sorted(migrations, key=lambda migration: migration[0]):
+            # Take the write lock before checking so concurrent starts don't apply twice
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,))
+            if cursor.fetchone():
+                conn.rollback()
+                continue
+
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+
+            cursor.execute('''
+                INSERT INTO schema_version (version, description) VALUES (?, ?)
+            ''', (version, description))
+            conn.commit()
+            applied.append(version)
+
+    if applied:
+        print(f"Applied migrations {applied} to {database}")
+
+    return applied
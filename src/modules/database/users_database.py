@@ -0,0 +1,77 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from modules.database.connection_pool import get_db_connection
+
+
+# Configuration
+USERS_DATABASE_ENV = 'USERS_DATABASE'  # Set to skip probing and use an explicit path
+POSSIBLE_USERS_DATABASE_PATHS = ['users.db', '../users.db']
+
+_users_database_path = None
+_resolve_lock = threading.Lock()
+
+
+def _has_users_table(path):
+    """Check a candidate file without creating it when it does not exist"""
+    if not os.path.isfile(path):
+        return False
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
+        return cursor.fetchone() is not None
+    finally:
+        conn.close()
+
+
+def resolve_users_database():
+    """Locate the users database once per process and return its path"""
+    global _users_database_path
+
+    if _users_database_path is not None:
+        return _users_database_path
+
+    with _resolve_lock:
+        if _users_database_path is None:
+            configured_path = os.environ.get(USERS_DATABASE_ENV)
+            candidates = [configured_path] if configured_path else POSSIBLE_USERS_DATABASE_PATHS
+
+            for path in candidates:
+                if _has_users_table(path):
+                    _users_database_path = path
+                    print(f"Found users database at: {path}")
+                    break
+            else:
+                raise RuntimeError(
+                    f"Could not find users database (tried: {', '.join(candidates)}). "
+                    f"Start the registration service first or set {USERS_DATABASE_ENV}."
+                )
+
+    return _users_database_path
+
+
+def get_users_db_connection():
+    """Borrow a pooled connection to the resolved users database"""
+    return get_db_connection(resolve_users_database())
+
+
+def get_users_version(database=None):
+    """ETag version of the user lists: users are only ever inserted, so the largest id changes with every signup"""
+    with get_db_connection(database or resolve_users_database()) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT MAX(id) FROM users')
+        return f'users-{cursor.fetchone()[0] or 0}'
+
+
+def get_user_version(user_id, database=None):
+    """ETag version of one user's public profile, a digest of the row; None if the user does not exist"""
+    with get_db_connection(database or resolve_users_database()) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, user_id, username, created_at FROM users WHERE user_id = ?', (user_id,))
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    digest = hashlib.sha256('\0'.join(str(value) for value in row).encode()).hexdigest()[:16]
+    return f'user-{row[1]}-{digest}'
@@ -0,0 +1,49 @@
+from functools import wraps
+from flask import request, make_response
+
+
+# Configuration
+PUBLIC_CACHE_CONTROL = 'no-cache'  # Clients keep the body but revalidate on every poll
+PRIVATE_CACHE_CONTROL = 'private, no-cache'  # Same, and shared caches must not store it
+
+
+def conditional_get(version_of, cache_control=PUBLIC_CACHE_CONTROL):
+    """Decorator adding a version-based ETag and If-None-Match handling to a GET view
+
+    version_of receives the view's arguments and returns a cheap version
+    token (a counter or a digest of a single row, not a hash of the whole
+    body). When the client already has that version the view is not called
+    at all and a 304 is returned. A None version means there is nothing to
+    validate against (e.g. the resource does not exist), so the view always
+    runs and answers for itself.
+
+    cache_control is sent on the 200 and the 304; views behind a token pass
+    PRIVATE_CACHE_CONTROL so shared caches never keep one user's response.
+
+    The version is read before the view runs, so a change that lands while
+    the body is built only makes the ETag older than the body, never newer;
+    the next poll then simply refetches.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            version = version_of(*args, **kwargs)
+            if version is None:
+                return f(*args, **kwargs)
+            etag = str(version)
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+                # Same Vary as the 200 it validates, so caches keep JSON and msgpack apart
+                response.vary.update(('Accept', 'Accept-Encoding'))
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = cache_control
+            return response
+
+        return decorated
+    return decorator
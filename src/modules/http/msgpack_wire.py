@@ -0,0 +1,139 @@
+from flask import Request, request
+from werkzeug.exceptions import BadRequest
+
+# Optional: without msgpack every endpoint keeps speaking JSON only
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Configuration
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+MSGPACK_PATH_PREFIX = '/auth/'  # Only the authenticated API negotiates msgpack
+COLUMNS_KEY = '_columns'
+ROWS_KEY = '_rows'
+
+MESSAGE_COLUMNS = ('message_id', 'sender', 'recipient', 'message', 'timestamp', 'is_read', 'direction')
+FRIEND_REQUEST_COLUMNS = (
+    'request_id', 'sender_user_id', 'sender_username', 'recipient_user_id',
+    'recipient_username', 'status', 'request_data', 'timestamp'
+)
+
+# Response fields holding row collections, sent column-encoded to msgpack clients
+ROW_COLUMNS = {
+    'messages': MESSAGE_COLUMNS,
+    'conversation': MESSAGE_COLUMNS,
+    'results': ('message_id', 'sender', 'recipient', 'message', 'timestamp', 'conversation_key', 'snippet', 'direction'),
+    'friends': ('friendship_id', 'friend_id', 'friend_username', 'friendship_date'),
+    'mutual_friends': ('friend_id', 'friend_username'),
+    'suggestions': ('user_id', 'username', 'mutual_friends'),
+    'users': ('user_id', 'username', 'created_at'),
+    'incoming_requests': FRIEND_REQUEST_COLUMNS,
+    'outgoing_requests': FRIEND_REQUEST_COLUMNS,
+    'pending_incoming': FRIEND_REQUEST_COLUMNS,
+    'pending_outgoing': FRIEND_REQUEST_COLUMNS,
+    'changes': ('change_id', 'entity', 'id', 'operation', 'data', 'changed_at'),
+}
+
+
+def msgpack_applies():
+    """Whether the current request is on a path that may answer in msgpack"""
+    return msgpack is not None and request.path.startswith(MSGPACK_PATH_PREFIX)
+
+
+def wants_msgpack():
+    """Whether the client prefers msgpack over JSON in Accept (JSON wins ties and */*)"""
+    if not msgpack_applies():
+        return False
+    return request.accept_mimetypes.best_match(('application/json',) + MSGPACK_MIMETYPES) in MSGPACK_MIMETYPES
+
+
+def row_columns(field, rows=()):
+    """Columns of a row collection: its declared ROW_COLUMNS, then any extra keys the rows carry"""
+    columns = list(ROW_COLUMNS[field])
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    return columns
+
+
+def encode_row(columns, row):
+    return [encode_compact(row.get(column)) for column in columns]
+
+
+def encode_compact(value):
+    """Prepare a JSON-style value for msgpack, sending row collections as columns
+
+    A list under one of the ROW_COLUMNS field names, such as 'messages',
+    always becomes {'_columns': [...], '_rows': [[...], ...]}, whether it
+    holds zero, one or many rows. Clients decode one shape per field, and
+    each key name is sent once per list instead of once per row.
+    """
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if key in ROW_COLUMNS and isinstance(item, (list, tuple)) and all(isinstance(row, dict) for row in item):
+                columns = row_columns(key, item)
+                encoded[key] = {COLUMNS_KEY: columns, ROWS_KEY: [encode_row(columns, row) for row in item]}
+            else:
+                encoded[key] = encode_compact(item)
+        return encoded
+
+    if isinstance(value, (list, tuple)):
+        return [encode_compact(item) for item in value]
+
+    return value
+
+
+def packb(value, default=None):
+    """Serialize a value as msgpack with the compact row encoding"""
+    return msgpack.packb(encode_compact(value), default=default, use_bin_type=True)
+
+
+def pack_row_stream(total, batches, to_item, list_key, count_key=None, envelope=None):
+    """Yield, batch by batch, the same bytes packb() gives for {..envelope, list_key: rows, count_key: total}
+
+    msgpack arrays carry their length up front, so the caller passes the
+    row count, read in the same snapshot as the rows.
+    """
+    packer = msgpack.Packer(use_bin_type=True)
+    columns = row_columns(list_key)
+    head = dict(envelope or {})
+
+    try:
+        yield packer.pack_map_header(len(head) + 1 + (1 if count_key else 0))
+        for key, value in head.items():
+            yield packer.pack(key) + packer.pack(encode_compact(value))
+
+        yield (packer.pack(list_key) + packer.pack_map_header(2)
+               + packer.pack(COLUMNS_KEY) + packer.pack(columns)
+               + packer.pack(ROWS_KEY) + packer.pack_array_header(total))
+        for batch in batches:
+            yield b''.join(packer.pack(encode_row(columns, to_item(row))) for row in batch)
+
+        if count_key:
+            yield packer.pack(count_key) + packer.pack(total)
+    finally:
+        batches.close()
+
+
+class WireFormatRequest(Request):
+    """Request whose get_json() also decodes msgpack bodies
+
+    Endpoints keep calling request.get_json(); a body sent as
+    application/msgpack comes back as the same dict a JSON body would.
+    """
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if msgpack is None or self.mimetype not in MSGPACK_MIMETYPES:
+            return super().get_json(force=force, silent=silent, cache=cache)
+
+        try:
+            return msgpack.unpackb(self.get_data(cache=cache), raw=False)
+        except Exception:
+            if silent:
+                return None
+            raise BadRequest('Failed to decode msgpack body')
@@ -0,0 +1,141 @@
+import gzip
+import os
+import zlib
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from modules.http.msgpack_wire import MSGPACK_MIMETYPE, WireFormatRequest, msgpack_applies, wants_msgpack, packb
+
+# Listed in requirements.txt; still imported softly so a missing wheel only
+# falls back to the stdlib json and gzip instead of breaking startup
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Configuration
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # Smaller bodies are sent as-is
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'application/msgpack', 'text/html', 'text/plain'}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, producing the same documents as the default provider
+
+    Keys stay sorted and debug mode still indents. datetime and other types
+    orjson would encode differently are handed to Flask's default() so
+    jsonify output does not change, only gets cheaper.
+    """
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for json.dumps-specific arguments get the stdlib path
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent)) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class WireFormatProvider(OrjsonProvider if orjson is not None else DefaultJSONProvider):
+    """JSON provider that answers jsonify with msgpack when an /auth/ client asks for it in Accept"""
+
+    def response(self, *args, **kwargs):
+        if wants_msgpack():
+            obj = self._prepare_response_obj(args, kwargs)
+            response = self._app.response_class(packb(obj, default=self.default), mimetype=MSGPACK_MIMETYPE)
+        else:
+            response = super().response(*args, **kwargs)
+
+        if msgpack_applies():
+            response.vary.add('Accept')
+        return response
+
+
+def _choose_encoding():
+    encodings = ['zstd', 'gzip'] if zstandard is not None else ['gzip']
+    return request.accept_encodings.best_match(encodings)
+
+
+def _compress(data, encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compress_stream(chunks, encoding):
+    """Compress a streamed body chunk by chunk, flushing so each chunk still reaches the client promptly"""
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        flush_block = lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        flush_block = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            yield compressor.compress(chunk) + flush_block()
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response):
+    """after_request hook: gzip/zstd the body when the client accepts it and it is worth it
+
+    Server-Sent Events are never compressed since every event has to reach
+    the client as soon as it is written.
+    """
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if not encoding:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(_compress(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def install_response_layer(app):
+    """Use orjson (and msgpack on request) for jsonify when installed, decode msgpack bodies and compress responses"""
+    app.json = WireFormatProvider(app)
+    app.request_class = WireFormatRequest
+    app.after_request(compress_response)
@@ -0,0 +1,93 @@
+import json
+from flask import Response, request
+from modules.database.connection_pool import get_db_connection
+from modules.http.msgpack_wire import MSGPACK_MIMETYPE, wants_msgpack, pack_row_stream
+
+
+# Configuration
+STREAM_BATCH_SIZE = 500  # Rows fetched from the cursor and written per chunk
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def iter_row_batches(database, query, params=(), batch_size=STREAM_BATCH_SIZE, with_count=False):
+    """Yield lists of rows from a query with fetchmany, holding one pooled connection until exhausted or closed
+
+    With with_count the row count is yielded first, read in the same
+    snapshot as the rows.
+    """
+    with get_db_connection(database) as conn:
+        cursor = conn.cursor()
+        try:
+            if with_count:
+                # The pool rolls this read transaction back when the connection is returned
+                conn.execute('BEGIN')
+                cursor.execute(f'SELECT COUNT(*) FROM ({query})', params)
+                yield cursor.fetchone()[0]
+
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            # An unfinished SELECT would keep its read snapshot on the pooled connection
+            cursor.close()
+
+
+def wants_ndjson():
+    """Whether the client prefers NDJSON over a single JSON document"""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _json_chunks(first_batch, batches, to_item, list_key, count_key, envelope):
+    try:
+        head = json.dumps(envelope)[:-1] + ', ' if envelope else '{'
+        yield f'{head}"{list_key}": ['
+
+        count = 0
+        batch = first_batch
+        while batch is not None:
+            chunk = ', '.join(json.dumps(to_item(row)) for row in batch)
+            yield (', ' if count else '') + chunk
+            count += len(batch)
+            batch = next(batches, None)
+
+        yield f'], "{count_key}": {count}}}\n' if count_key else ']}\n'
+    finally:
+        batches.close()
+
+
+def _ndjson_chunks(first_batch, batches, to_item):
+    try:
+        batch = first_batch
+        while batch is not None:
+            yield ''.join(json.dumps(to_item(row)) + '\n' for row in batch)
+            batch = next(batches, None)
+    finally:
+        batches.close()
+
+
+def stream_collection(database, query, to_item, list_key, count_key=None, envelope=None, params=()):
+    """Stream the rows of a query as {..envelope, list_key: [...], count_key: n}, or as NDJSON when asked for
+
+    On /auth/ paths msgpack clients get the same document packb() would
+    produce, rows column-encoded, written batch by batch. Only one batch of
+    rows is in memory at a time. The query runs here, before the response
+    starts, so a failing query still raises in the view and becomes its
+    usual error response.
+    """
+    if wants_msgpack():
+        batches = iter_row_batches(database, query, params, with_count=True)
+        total = next(batches)
+        response = Response(pack_row_stream(total, batches, to_item, list_key, count_key, envelope), mimetype=MSGPACK_MIMETYPE)
+    else:
+        batches = iter_row_batches(database, query, params)
+        first_batch = next(batches, None)
+        if wants_ndjson():
+            response = Response(_ndjson_chunks(first_batch, batches, to_item), mimetype=NDJSON_MIMETYPE)
+        else:
+            response = Response(_json_chunks(first_batch, batches, to_item, list_key, count_key, envelope), mimetype='application/json')
+
+    response.vary.add('Accept')
+    return response
@@ -1,31 +1,64 @@
 from flask import Flask, request, jsonify
 import sqlite3
 import os
+import threading
 from werkzeug.security import generate_password_hash
+from modules.database.connection_pool import get_db_connection
 
 app = Flask(__name__)
 
 # Database configuration
 DATABASE = 'users.db'
+ID_BLOCK_SIZE = 100  # User ids leased from users.db per write
+
+
+class UserIdAllocator:
+    """Hands out user id numbers from blocks leased atomically from users.db
+
+    Each lease bumps the id_allocator high-water mark by block_size in one
+    short write transaction, so concurrent registrations (and several
+    registration processes) never draw the same number. Ids left in a block
+    when the process exits are skipped, never reused.
+    """
+
+    def __init__(self, database=DATABASE, name='user_id', block_size=ID_BLOCK_SIZE):
+        self.database = database
+        self.name = name
+        self.block_size = block_size
+        self._next = 0
+        self._limit = 0  # Last number of the current block
+        self._lock = threading.Lock()
+
+    def _lease_block(self):
+        with get_db_connection(self.database) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE id_allocator SET high_water = high_water + ? WHERE name = ?
+            ''', (self.block_size, self.name))
+            cursor.execute('SELECT high_water FROM id_allocator WHERE name = ?', (self.name,))
+            high_water = cursor.fetchone()[0]
+            conn.commit()
+
+        self._next = high_water - self.block_size + 1
+        self._limit = high_water
+
+    def next_number(self):
+        """Get the next unused id number"""
+        with self._lock:
+            if self._next == 0 or self._next > self._limit:
+                self._lease_block()
+            number = self._next
+            self._next += 1
+            return number
+
+
+user_id_allocator = UserIdAllocator()
+
 
 def get_next_user_id():
     """Generate the next user ID in format Uxx"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-
-    # Get the highest user number
-    cursor.execute("SELECT user_id FROM users ORDER BY id DESC LIMIT 1")
-    result = cursor.fetchone()
-
-    if result:
-        # Extract number from last user_id (e.g., "U05" -> 5)
-        last_user_id = result[0]
-        last_number = int(last_user_id[1:])
-        next_number = last_number + 1
-    else:
-        next_number = 1
-
-    conn.close()
+    next_number = user_id_allocator.next_number()
 
     # Format as Uxx (e.g., U01, U02, etc.)
     return f"U{next_number:02d}"
@@ -2,18 +2,17 @@ from flask import Flask, request, jsonify
 import sqlite3
 import os
 from werkzeug.security import generate_password_hash
+from modules.database.migrations import run_migrations
 
 app = Flask(__name__)
 
 # Database configuration
 DATABASE = 'users.db'
 
-def init_db():
-    """Initialize the database with users table"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-
-    cursor.execute('''
+# Ordered schema migrations for users.db: (version, description, steps)
+USERS_MIGRATIONS = [
+    (1, 'Create users table', [
+        '''
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id TEXT UNIQUE NOT NULL,
@@ -21,7 +20,41 @@ def init_db():
             password_hash TEXT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
+        ''',
+    ]),
+    (2, 'Index users by username', [
+        'CREATE INDEX IF NOT EXISTS idx_users_username ON users (username)',
+    ]),
+    # High-water mark for leased user id blocks, seeded from the existing Uxx ids
+    (3, 'Add user id allocator', [
+        '''
+        CREATE TABLE IF NOT EXISTS id_allocator (
+            name TEXT PRIMARY KEY,
+            high_water INTEGER NOT NULL
+        )
+        ''',
+        '''
+        INSERT OR IGNORE INTO id_allocator (name, high_water)
+        SELECT 'user_id', COALESCE(MAX(CAST(SUBSTR(user_id, 2) AS INTEGER)), 0) FROM users
+        ''',
+    ]),
+    # Only a sha256 of each opaque refresh token is stored
+    (4, 'Add refresh tokens', [
+        '''
+        CREATE TABLE IF NOT EXISTS refresh_tokens (
+            token_hash TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            username TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL,
+            revoked_at TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_id ON refresh_tokens (user_id)',
+    ]),
+]
+
 
-    conn.commit()
-    conn.close()
+def init_db():
+    """Initialize the users database by applying pending migrations"""
+    run_migrations(DATABASE, USERS_MIGRATIONS)
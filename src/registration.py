@@ -7,12 +7,14 @@ from modules.registration.init_db import init_db
 from apis.registration.get_all_users import get_whole_users
 from apis.registration.get_specific_user import get_specific_user
 from apis.registration.signup import signup_login
+from modules.http.response_layer import install_response_layer
 
 # Database configuration
 DATABASE = 'users.db'
 
 
 app = Flask(__name__)
+install_response_layer(app)
 
 
 app.register_blueprint(get_whole_users)
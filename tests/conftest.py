@@ -0,0 +1,44 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+@pytest.fixture(scope='session')
+def clients(tmp_path_factory):
+    """Registration, auth and chat test clients on fresh databases in a temp copy of src"""
+    work = tmp_path_factory.mktemp('chat_app') / 'src'
+    shutil.copytree(SRC, work, ignore=shutil.ignore_patterns('__pycache__', '*.db', 'archive'))
+
+    previous_cwd = os.getcwd()
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'
+    os.chdir(work)
+    sys.path.insert(0, str(work))
+    try:
+        import registration, auth_app, chat
+        from modules.registration.init_db import init_db
+        from modules.chat.init_chat_db import init_chat_db
+
+        init_db()
+        init_chat_db()
+        yield registration.app.test_client(), auth_app.app.test_client(), chat.app.test_client()
+    finally:
+        sys.path.remove(str(work))
+        os.chdir(previous_cwd)
+
+
+@pytest.fixture
+def login(clients):
+    """Register a user and return Authorization headers carrying their token"""
+    registration_client, auth_client, _ = clients
+
+    def login(username):
+        registration_client.post('/register', headers={'username': username, 'password': 'pw'})
+        token = auth_client.post('/login', json={'username': username, 'password': 'pw'}).json['token']
+        return {'Authorization': f'Bearer {token}'}
+
+    return login
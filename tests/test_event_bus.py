@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.fixture
+def event_bus_module(clients):
+    from modules.chat import event_bus
+    return event_bus
+
+
+def test_dropped_events_produce_resync_marker(event_bus_module):
+    bus = event_bus_module.EventBus()
+
+    with bus.subscription('u1'):
+        start = bus.current_sequence()
+        sequences = [bus.publish('u1', 'message', {'n': n}) for n in range(event_bus_module.EVENT_BUFFER_SIZE + 5)]
+
+        events = bus.wait('u1', start, 0)
+        assert events[0] == (sequences[4], 'resync_required', {'sync_url': '/auth/sync'})
+        assert [event[0] for event in events[1:]] == sequences[5:]
+
+        # Resuming from inside the buffer needs no resync
+        assert bus.wait('u1', sequences[-2], 0) == [(sequences[-1], 'message', {'n': len(sequences) - 1})]
+
+
+def test_channels_without_subscribers_are_removed(event_bus_module, monkeypatch):
+    bus = event_bus_module.EventBus()
+
+    # Nobody is listening, so nothing is kept
+    bus.publish('offline', 'message', {})
+    assert 'offline' not in bus._channels
+
+    with bus.subscription('u2'):
+        last_seen = bus.publish('u2', 'message', {})
+
+    monkeypatch.setattr(event_bus_module, 'CHANNEL_IDLE_SECONDS', 0)
+    bus.publish('u3', 'message', {})
+    assert bus._channels == {}
+
+    # A client resuming after its channel was dropped is told to resync
+    bus.publish('u2', 'message', {})
+    events = bus.wait('u2', last_seen, 0)
+    assert [event[1] for event in events] == ['resync_required']
@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.fixture
+def graph(clients):
+    from modules.chat.friend_graph import FriendGraph
+
+    graph = FriendGraph()
+    graph._loaded = True
+    for friendship_id, (user1, user2) in enumerate([('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('c', 'e')], 1):
+        graph.add((friendship_id, user1, user1.upper(), user2, user2.upper(), '2026-01-01'))
+    return graph
+
+
+def test_suggestions_rank_friends_of_friends(graph):
+    assert graph.suggest_friends('a') == [
+        {'user_id': 'd', 'username': 'D', 'mutual_friends': 2},
+        {'user_id': 'e', 'username': 'E', 'mutual_friends': 1},
+    ]
+
+
+def test_suggestions_recompute_after_a_friend_changes(graph, monkeypatch):
+    graph.suggest_friends('a')
+
+    # Scoring runs outside the lock; a change landing meanwhile must not be cached over
+    from modules.chat import friend_graph as friend_graph_module
+    real_counter = friend_graph_module.Counter
+
+    def counter_with_concurrent_change(*args):
+        graph.remove('c', 'e')
+        return real_counter(*args)
+
+    graph.add((6, 'b', 'B', 'f', 'F', '2026-01-02'))
+    monkeypatch.setattr(friend_graph_module, 'Counter', counter_with_concurrent_change)
+    assert [s['user_id'] for s in graph.suggest_friends('a')] == ['d', 'e', 'f']
+    monkeypatch.setattr(friend_graph_module, 'Counter', real_counter)
+
+    assert [s['user_id'] for s in graph.suggest_friends('a')] == ['d', 'f']
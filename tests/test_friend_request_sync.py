@@ -0,0 +1,44 @@
+def test_reverse_request_after_reject_keeps_rejected_request(clients, login):
+    chat_client = clients[2]
+    alice = login('alice')
+    bob = login('bob')
+
+    first = chat_client.post('/auth/send_friend_request', json={'username': 'alice'}, headers=bob)
+    assert first.status_code == 201
+    first_id = first.json['request_id']
+
+    rejected = chat_client.post('/auth/respond_friend_request', json={'username': 'bob', 'action': 'reject'}, headers=alice)
+    assert rejected.status_code == 200
+
+    reverse = chat_client.post('/auth/send_friend_request', json={'username': 'bob'}, headers=alice)
+    assert reverse.status_code == 201
+    reverse_id = reverse.json['request_id']
+    assert reverse_id != first_id
+
+    outgoing = chat_client.get('/auth/get_friend_requests', headers=alice).json
+    statuses = {r['request_id']: r['status'] for r in outgoing['incoming_requests'] + outgoing['outgoing_requests']}
+    assert statuses == {first_id: 'rejected', reverse_id: 'pending'}
+
+    changes = chat_client.get('/auth/sync', headers=alice).json['changes']
+    request_changes = [c for c in changes if c['entity'] == 'friend_request']
+    assert all(c['operation'] != 'delete' for c in request_changes)
+    latest = {c['id']: c['data']['status'] for c in request_changes}
+    assert latest == {str(first_id): 'rejected', str(reverse_id): 'pending'}
+
+
+def test_resending_after_reject_keeps_request_id(clients, login):
+    chat_client = clients[2]
+    carol = login('carol')
+    dave = login('dave')
+
+    first_id = chat_client.post('/auth/send_friend_request', json={'username': 'dave'}, headers=carol).json['request_id']
+    chat_client.post('/auth/respond_friend_request', json={'username': 'carol', 'action': 'reject'}, headers=dave)
+    again = chat_client.post('/auth/send_friend_request', json={'username': 'dave'}, headers=carol)
+
+    assert again.status_code == 201
+    assert again.json['request_id'] == first_id
+
+    changes = chat_client.get('/auth/sync', headers=dave).json['changes']
+    request_changes = [c for c in changes if c['entity'] == 'friend_request']
+    assert [c['data']['status'] for c in request_changes] == ['pending', 'rejected', 'pending']
+    assert all(c['operation'] == 'upsert' for c in request_changes)
@@ -0,0 +1,22 @@
+from concurrent.futures import Future
+
+
+class _StalledExecutor:
+    def submit(self, fn, *args):
+        return Future()
+
+
+def test_login_answers_503_when_password_check_times_out(clients, login, monkeypatch):
+    from modules.auth_app import password_hashing_pool as pool_module
+
+    auth_client = clients[1]
+    login('olga')
+
+    pool = pool_module.password_hashing_pool
+    monkeypatch.setattr(pool, 'workers', 1)
+    monkeypatch.setattr(pool, '_get_executor', lambda: _StalledExecutor())
+    monkeypatch.setattr(pool_module, 'PASSWORD_HASH_TIMEOUT', 0.01)
+
+    response = auth_client.post('/login', json={'username': 'olga', 'password': 'pw'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,27 @@
+import sqlite3
+
+
+def _token_rows(username):
+    with sqlite3.connect('users.db') as conn:
+        return conn.execute('''
+            SELECT revoked_at FROM refresh_tokens WHERE username = ?
+        ''', (username,)).fetchall()
+
+
+def test_rotation_and_revocation_delete_dead_tokens(clients, login):
+    auth_client = clients[1]
+    login('ivan')
+
+    refresh_token = auth_client.post('/login', json={'username': 'ivan', 'password': 'pw'}).json['refresh_token']
+    for _ in range(3):
+        response = auth_client.post('/refresh', json={'refresh_token': refresh_token})
+        assert response.status_code == 200
+        refresh_token = response.json['refresh_token']
+
+    # One live token per login; the rotated-out ones are gone
+    assert _token_rows('ivan') == [(None,), (None,)]
+
+    assert auth_client.post('/refresh', json={'refresh_token': 'not-a-token'}).status_code == 401
+    assert auth_client.post('/revoke', json={'refresh_token': refresh_token, 'all_sessions': True}).json['revoked'] == 2
+    assert _token_rows('ivan') == []
+    assert auth_client.post('/refresh', json={'refresh_token': refresh_token}).status_code == 401
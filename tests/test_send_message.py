@@ -0,0 +1,64 @@
+import jwt
+
+
+def _user_id(headers):
+    return jwt.decode(headers['Authorization'].split()[1], options={'verify_signature': False})['user_id']
+
+
+def test_retry_with_same_idempotency_key_returns_first_message(clients, login):
+    chat_client = clients[2]
+    erin = login('erin')
+    frank_id = _user_id(login('frank'))
+
+    body = {'message': 'hello', 'recipient_user_id': frank_id}
+    headers = dict(erin, **{'Idempotency-Key': 'erin-1'})
+    first = chat_client.post('/auth/send_message', json=body, headers=headers)
+    retry = chat_client.post('/auth/send_message', json=body, headers=headers)
+    other = chat_client.post('/auth/send_message', json=body, headers=dict(erin, **{'Idempotency-Key': 'erin-2'}))
+
+    assert first.status_code == 201
+    assert retry.status_code == 200
+    assert retry.json['message_id'] == first.json['message_id']
+    assert retry.json['timestamp'] == first.json['timestamp']
+
+    reused = chat_client.post('/auth/send_message', json=dict(body, message='changed'), headers=headers)
+    assert reused.status_code == 409
+    assert other.status_code == 201
+    assert other.json['message_id'] != first.json['message_id']
+
+    messages = chat_client.get('/auth/messages', headers=erin).json['messages']
+    assert sorted(m['message_id'] for m in messages) == sorted([first.json['message_id'], other.json['message_id']])
+
+
+def test_send_timeout_reports_unknown_outcome(clients, login, monkeypatch):
+    from modules.chat.message_writer import message_writer, MessageOutcomeUnknown
+
+    chat_client = clients[2]
+    gina = login('gina')
+    hank_id = _user_id(login('hank'))
+
+    def still_queued(*args, **kwargs):
+        raise MessageOutcomeUnknown('Message is still queued; it may or may not be stored')
+
+    monkeypatch.setattr(message_writer, 'send', still_queued)
+    response = chat_client.post('/auth/send_message', json={'message': 'hi', 'recipient_user_id': hank_id},
+                                headers=dict(gina, **{'Idempotency-Key': 'gina-1'}))
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.json['outcome'] == 'unknown'
+    assert response.json['client_message_id'] == 'gina-1'
+
+
+def test_deleted_message_text_is_not_left_in_sync(clients, login):
+    chat_client = clients[2]
+    kate = login('kate')
+    liam = login('liam')
+
+    sent = chat_client.post('/auth/send_message', json={'message': 'my secret', 'recipient_user_id': _user_id(liam)}, headers=kate)
+    message_id = sent.json['message_id']
+    assert chat_client.delete(f'/auth/delete_message/{message_id}', headers=kate).status_code == 200
+
+    changes = chat_client.get('/auth/sync', headers=liam).json['changes']
+    message_changes = [c for c in changes if c['entity'] == 'message' and c['id'] == str(message_id)]
+    assert [(c['operation'], c['data']) for c in message_changes] == [('delete', None)]
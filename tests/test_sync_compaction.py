@@ -0,0 +1,46 @@
+import sqlite3
+
+import jwt
+
+
+def _user_id(headers):
+    return jwt.decode(headers['Authorization'].split()[1], options={'verify_signature': False})['user_id']
+
+
+def test_change_log_compaction_and_resync(clients, login):
+    from modules.chat.change_log import collapse_superseded_changes, prune_old_changes
+
+    chat_client = clients[2]
+    mona = login('mona')
+    nick = login('nick')
+    nick_id = _user_id(nick)
+
+    first = chat_client.post('/auth/send_message', json={'message': 'one', 'recipient_user_id': nick_id}, headers=mona).json
+    chat_client.post('/auth/send_message', json={'message': 'two', 'recipient_user_id': nick_id}, headers=mona)
+    chat_client.put(f"/auth/mark_read/{first['message_id']}", headers=nick)
+    before = chat_client.get('/auth/sync', headers=nick).json
+
+    # Re-sending a request overwrites the earlier upsert of the same request
+    chat_client.post('/auth/send_friend_request', json={'username': 'nick'}, headers=mona)
+    chat_client.post('/auth/respond_friend_request', json={'username': 'mona', 'action': 'reject'}, headers=nick)
+    collapse_superseded_changes()
+    request_changes = [c for c in chat_client.get('/auth/sync', headers=nick).json['changes'] if c['entity'] == 'friend_request']
+    assert [c['data']['status'] for c in request_changes] == ['rejected']
+
+    # Mark-read updates survive collapsing, since they follow the upsert
+    messages = [c for c in chat_client.get('/auth/sync', headers=nick).json['changes'] if c['entity'] == 'message']
+    assert [c['operation'] for c in messages] == [c['operation'] for c in before['changes'] if c['entity'] == 'message']
+
+    with sqlite3.connect('chat.db') as conn:
+        conn.execute("UPDATE change_log SET created_at = '2000-01-01 00:00:00'")
+    assert prune_old_changes() > 0
+
+    stale = chat_client.get('/auth/sync', headers=nick).json
+    assert stale['resync_required'] is True
+    assert stale['changes'] == []
+    fresh = chat_client.get('/auth/sync', query_string={'since': stale['next_cursor']}, headers=nick).json
+    assert fresh['resync_required'] is False
+
+    # Other tests sync from 0 against the same database
+    with sqlite3.connect('chat.db') as conn:
+        conn.execute('UPDATE change_log_horizon SET pruned_through = 0')
@@ -0,0 +1,32 @@
+def test_specific_user_etag_requires_existing_user(clients, login):
+    registration_client = clients[0]
+    login('judy')
+    user_id = next(u['user_id'] for u in registration_client.get('/users').json['users'] if u['username'] == 'judy')
+
+    first = registration_client.get(f'/user/{user_id}')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    cached = registration_client.get(f'/user/{user_id}', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    # The same kind of tag for a user that does not exist is not honoured
+    missing = registration_client.get('/user/no-such-user', headers={'If-None-Match': 'W/"user-no-such-user", *'})
+    assert missing.status_code == 404
+    assert 'ETag' not in missing.headers
+
+
+def test_token_protected_lists_are_private(clients, login):
+    chat_client = clients[2]
+    paul = login('paul')
+
+    for path in ('/auth/get_friends', '/auth/get_friend_requests', '/auth/users'):
+        response = chat_client.get(path, headers=paul)
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+
+        cached = chat_client.get(path, headers=dict(paul, **{'If-None-Match': response.headers['ETag']}))
+        assert cached.status_code == 304
+        assert cached.headers['Cache-Control'] == 'private, no-cache'
+
+    assert clients[0].get('/users').headers['Cache-Control'] == 'no-cache'
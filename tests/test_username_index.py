@@ -0,0 +1,16 @@
+import time
+
+
+def test_typeahead_picks_up_registrations_from_the_database(clients, login):
+    chat_client = clients[2]
+    quinn = login('quinn')
+
+    # Registration never touches the chat process's index; its refresher finds the row
+    deadline = time.monotonic() + 5
+    while True:
+        users = chat_client.get('/auth/search_user/prefix', query_string={'q': 'qui'}, headers=quinn).json['users']
+        if users or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+
+    assert [user['username'] for user in users] == ['quinn']